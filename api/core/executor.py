@@ -0,0 +1,110 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from hate_speech.config import settings
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class BoundedExecutor:
+    """
+    Dedicated thread pool for CPU-bound model work with a bounded wait queue.
+
+    At most `max_workers` jobs run at once and at most `max_queue` more may
+    wait; anything beyond that is rejected immediately with QueueFullError
+    so the route can shed load instead of letting latency grow unbounded.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "predict"):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.name = name
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Created on first use so a preloading parent process never owns worker threads.
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=self.name
+                    )
+        return self._pool
+
+    def _job(self, enqueued_at: float, ctx: contextvars.Context, fn: Callable) -> Any:
+        wait = time.monotonic() - enqueued_at
+        with self._lock:
+            self._running += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        try:
+            return ctx.run(fn)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise QueueFullError(f"{self.name} queue is full")
+
+        with self._lock:
+            self._in_flight += 1
+        job = functools.partial(
+            self._job,
+            time.monotonic(),
+            contextvars.copy_context(),
+            functools.partial(fn, *args, **kwargs),
+        )
+        try:
+            future = self._get_pool().submit(job)
+        except BaseException:
+            self._finish(None)
+            raise
+        # The slot belongs to the job, not to the awaiting coroutine: if the
+        # client disconnects, the job may still be queued or running, so the
+        # slot is only freed once it finishes (or is cancelled before starting).
+        future.add_done_callback(self._finish)
+        return await asyncio.wrap_future(future)
+
+    def _finish(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._in_flight - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_avg_ms": (self._wait_total / started * 1000) if started else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+            }
+
+
+predict_executor = BoundedExecutor(
+    max_workers=settings.PREDICT_MAX_WORKERS,
+    max_queue=settings.PREDICT_MAX_QUEUE,
+)
@@ -0,0 +1,153 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from db.counters import apply_deltas, sum_deltas
+from db.models import Feedback
+from db.session import SessionLocal
+from hate_speech.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+def bulk_insert_feedback(db: Session, rows: List[Dict], chunk_size: int = 500) -> int:
+    """
+    Inserts feedback rows with one executemany per chunk and a single commit.
+    """
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(Feedback), rows[start:start + chunk_size])
+    apply_deltas(db, sum_deltas(rows))
+    db.commit()
+    return len(rows)
+
+
+class FeedbackWriteBehind:
+    """
+    Background group-commit for feedback rows.
+
+    Rows are queued and flushed by a worker thread once `max_batch` rows
+    are waiting or the oldest has waited `max_delay_ms`, whichever is first.
+    Rows were already acknowledged, so a failed flush is retried up to
+    `max_retries` times with exponential backoff before it is dropped and logged.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 200,
+        max_delay_ms: float = 250.0,
+        max_queue: int = 10000,
+        max_retries: int = 3,
+        retry_backoff_ms: float = 200.0,
+    ):
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff_ms / 1000.0
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.flushed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop.clear()
+            self._worker = threading.Thread(
+                target=self._run, name="feedback-write-behind", daemon=True
+            )
+            self._worker.start()
+
+    def enqueue(self, rows: List[Dict]) -> bool:
+        """
+        Queues rows for the next group commit. Returns False, without
+        queueing anything, when there is not enough room.
+        """
+        self._ensure_worker()
+        with self._lock:
+            if self._queue.maxsize and self._queue.qsize() + len(rows) > self._queue.maxsize:
+                return False
+            for row in rows:
+                self._queue.put_nowait(row)
+        return True
+
+    def _collect(self) -> List[Dict]:
+        try:
+            rows = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_delay
+        while len(rows) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                rows.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return rows
+
+    def _insert(self, rows: List[Dict]) -> bool:
+        db = SessionLocal()
+        try:
+            bulk_insert_feedback(db, rows, chunk_size=self.max_batch)
+            return True
+        except Exception:
+            db.rollback()
+            logger.warning("Feedback write-behind flush of %d rows failed", len(rows), exc_info=True)
+            return False
+        finally:
+            db.close()
+
+    def _flush(self, rows: List[Dict]) -> None:
+        for attempt in range(self.max_retries + 1):
+            if self._insert(rows):
+                self.flushed += len(rows)
+                return
+            if attempt < self.max_retries:
+                self.retried += 1
+                time.sleep(min(self.retry_backoff * 2 ** attempt, 5.0))
+        self.failed += len(rows)
+        logger.error(
+            "Dropped %d acknowledged feedback rows after %d failed flush attempts",
+            len(rows),
+            self.max_retries + 1,
+        )
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            rows = self._collect()
+            if rows:
+                self._flush(rows)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "flushed": self.flushed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+feedback_writer = FeedbackWriteBehind(
+    max_batch=settings.FEEDBACK_WRITE_BEHIND_MAX_BATCH,
+    max_delay_ms=settings.FEEDBACK_WRITE_BEHIND_MAX_DELAY_MS,
+    max_queue=settings.FEEDBACK_WRITE_BEHIND_QUEUE_SIZE,
+    max_retries=settings.FEEDBACK_WRITE_BEHIND_MAX_RETRIES,
+    retry_backoff_ms=settings.FEEDBACK_WRITE_BEHIND_RETRY_BACKOFF_MS,
+)
@@ -0,0 +1,127 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.executor import predict_executor
+from api.core.prediction_cache import prediction_cache
+from api.core.redis_client import redis_breaker
+from hate_speech.config import settings
+from hate_speech.metrics import (
+    HTTP_ERRORS_TOTAL,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS_TOTAL,
+    CounterCallback,
+    GaugeCallback,
+    registry,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _route_label(scope: Scope) -> str:
+    # Use the route template, not the raw path, to keep label cardinality bounded.
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: a request is timed until the last body chunk is
+    sent, so streaming responses count their full duration, not just the
+    time to the response headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            # The router fills in scope["route"] while handling the request.
+            route = _route_label(scope)
+            method = scope["method"]
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, route=route, method=method)
+            HTTP_REQUESTS_TOTAL.inc(route=route, method=method, status=status_code)
+            if status_code >= 500:
+                HTTP_ERRORS_TOTAL.inc(route=route, method=method)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            status_code = 500
+            raise
+        finally:
+            # Covers failures and disconnects before the body completed.
+            record()
+
+
+def register_api_metrics(inference_service) -> None:
+    def model_info():
+        readiness = inference_service.readiness()
+        return [(
+            {
+                "model_version": readiness.get("model_version") or "unloaded",
+                "model_dir": readiness.get("model_dir") or "",
+                "backend": settings.INFERENCE_BACKEND,
+            },
+            1.0 if readiness.get("ready") else 0.0,
+        )]
+
+    def cache_lookups():
+        stats = prediction_cache.stats()
+        return [
+            ({"result": "local_hit"}, stats["local_hits"]),
+            ({"result": "redis_hit"}, stats["redis_hits"]),
+            ({"result": "miss"}, stats["misses"]),
+        ]
+
+    def executor_state():
+        stats = predict_executor.stats()
+        return [
+            ({"state": "running"}, stats["running"]),
+            ({"state": "queued"}, stats["queue_depth"]),
+        ]
+
+    registry.register(GaugeCallback(
+        "hate_speech_model_info", "Active model version (1 when loaded).", model_info
+    ))
+    registry.register(CounterCallback(
+        "hate_speech_prediction_cache_lookups_total", "Prediction cache lookups by result.", cache_lookups
+    ))
+    registry.register(GaugeCallback(
+        "hate_speech_prediction_cache_hit_ratio",
+        "Share of prediction cache lookups served from cache.",
+        lambda: [({}, prediction_cache.stats()["hit_ratio"])],
+    ))
+    registry.register(GaugeCallback(
+        "hate_speech_predict_executor", "Predict executor jobs by state.", executor_state
+    ))
+    registry.register(CounterCallback(
+        "hate_speech_predict_executor_rejected_total",
+        "Predict jobs rejected because the executor queue was full.",
+        lambda: [({}, predict_executor.stats()["rejected"])],
+    ))
+    registry.register(GaugeCallback(
+        "hate_speech_redis_breaker_open",
+        "1 while the Redis circuit breaker is not closed.",
+        lambda: [({}, 0.0 if redis_breaker.state == "closed" else 1.0)],
+    ))
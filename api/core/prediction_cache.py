@@ -0,0 +1,171 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from api.core.redis_client import (
+    PREDICTION_KEY_PREFIX,
+    get_cached_prediction,
+    get_cached_predictions,
+    set_cached_prediction,
+    set_cached_predictions,
+)
+from hate_speech.config import settings
+
+
+class PredictionCache:
+    """
+    Two-tier cache of full `predict` results.
+
+    Tier 1 is a bounded in-process LRU with a TTL; tier 2 is Redis.
+    Keys are namespaced by model version and preprocessing config, so a
+    model reload simply stops matching old entries. That namespacing plus
+    the Redis TTL is the whole invalidation story: stale Redis entries are
+    never swept, because workers that have not reloaded yet still use them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 600,
+        redis_ttl_seconds: int = 86400,
+        enabled: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        # Exact text, not the case-folded override hash: results echo the
+        # request text back under preprocessing["original"].
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        return f"{PREDICTION_KEY_PREFIX}:{namespace}:{digest}"
+
+    def _get_local(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, namespace: str, text: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+
+        key = self.make_key(namespace, text)
+        value = self._get_local(key)
+        if value is not None:
+            self._count("local_hits")
+            return value
+
+        value = get_cached_prediction(key)
+        if value is not None:
+            self._count("redis_hits")
+            self._set_local(key, value)
+            return value
+
+        self._count("misses")
+        return None
+
+    def get_many(self, namespace: str, texts: Sequence[str]) -> List[Optional[Dict]]:
+        """
+        Like get() for many texts: local hits first, then one MGET for the rest.
+        """
+        if not self.enabled:
+            return [None] * len(texts)
+
+        keys = [self.make_key(namespace, text) for text in texts]
+        results = [self._get_local(key) for key in keys]
+        local_hits = sum(1 for r in results if r is not None)
+
+        missing = list(dict.fromkeys(k for k, r in zip(keys, results) if r is None))
+        found = dict(zip(missing, get_cached_predictions(missing)))
+        redis_hits = misses = 0
+        for i, key in enumerate(keys):
+            if results[i] is not None:
+                continue
+            value = found.get(key)
+            if value is None:
+                misses += 1
+                continue
+            redis_hits += 1
+            self._set_local(key, value)
+            results[i] = value
+
+        with self._lock:
+            self._stats["local_hits"] += local_hits
+            self._stats["redis_hits"] += redis_hits
+            self._stats["misses"] += misses
+        return results
+
+    @staticmethod
+    def _storable(result: Dict) -> Dict:
+        return {k: v for k, v in result.items() if k != "sentence_bert_embedding"}
+
+    def set(self, namespace: str, text: str, result: Dict) -> None:
+        if not self.enabled:
+            return
+
+        key = self.make_key(namespace, text)
+        value = self._storable(result)
+        self._set_local(key, value)
+        set_cached_prediction(key, value, self.redis_ttl_seconds)
+
+    def set_many(self, entries: Sequence[Tuple[str, str, Dict]]) -> None:
+        """
+        Stores (namespace, text, result) entries; Redis gets one pipelined write.
+        """
+        if not self.enabled or not entries:
+            return
+
+        items = []
+        for namespace, text, result in entries:
+            key = self.make_key(namespace, text)
+            value = self._storable(result)
+            self._set_local(key, value)
+            items.append((key, value))
+        set_cached_predictions(items, self.redis_ttl_seconds)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_entries"] = len(self._entries)
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        hits = stats["local_hits"] + stats["redis_hits"]
+        stats["hit_ratio"] = (hits / lookups) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        return stats
+
+
+prediction_cache = PredictionCache(
+    max_entries=settings.PREDICTION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+    redis_ttl_seconds=settings.PREDICTION_CACHE_REDIS_TTL_SECONDS,
+    enabled=settings.PREDICTION_CACHE_ENABLED,
+)
@@ -0,0 +1,151 @@
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+
+from hate_speech.config import settings
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    # ';' separates frames in the collapsed format
+    return name.replace(";", ":")
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of the threads serving the next N armed requests and
+    writes them in collapsed-stack format ("frame;frame;frame count"), which
+    flamegraph.pl and speedscope read directly.
+    """
+
+    def __init__(self, output_dir: str, interval_ms: float):
+        self.output_dir = Path(output_dir)
+        self.interval = interval_ms / 1000.0
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._profiled = 0
+        self._active: Set[int] = set()
+        self._samples: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_profile: Optional[str] = None
+
+    def arm(self, requests: int) -> None:
+        with self._lock:
+            if self._remaining == 0 and not self._active:
+                self._samples = Counter()
+                self._profiled = 0
+            self._remaining = requests
+
+    def disarm(self) -> None:
+        with self._lock:
+            self._remaining = 0
+            finished = not self._active
+        if finished:
+            self._finish()
+
+    @property
+    def armed(self) -> bool:
+        return self._remaining > 0
+
+    @contextmanager
+    def profile_request(self) -> Iterator[bool]:
+        """
+        Samples the current thread if an armed slot is available; yields
+        whether this request is being profiled.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            claimed = self._remaining > 0
+            if claimed:
+                self._remaining -= 1
+                self._active.add(ident)
+                self._start_sampler()
+        if not claimed:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            with self._lock:
+                self._active.discard(ident)
+                self._profiled += 1
+                finished = self._remaining == 0 and not self._active
+            if finished:
+                self._finish()
+
+    def _start_sampler(self) -> None:
+        if self._thread is not None and not self._stop.is_set():
+            return
+        # A fresh stop event per sampler, so a re-arm during _finish cannot revive the old one.
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.wait(self.interval):
+            with self._lock:
+                active = set(self._active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for ident in active:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self._samples[_collapse(frame)] += 1
+
+    def _finish(self) -> None:
+        with self._lock:
+            stop, thread = self._stop, self._thread
+            self._thread = None
+        stop.set()
+        if thread is not None:
+            thread.join(timeout=1.0)
+
+        with self._lock:
+            samples, self._samples = self._samples, Counter()
+            profiled = self._profiled
+        if not samples:
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = self.output_dir / f"profile-{stamp}-{profiled}req.folded"
+        with open(path, "w") as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f"{stack} {count}\n")
+        self._last_profile = str(path)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "remaining": self._remaining,
+                "in_progress": len(self._active),
+                "profiled": self._profiled,
+                "samples": sum(self._samples.values()),
+                "interval_ms": self.interval * 1000,
+                "last_profile": self._last_profile,
+            }
+
+
+profiler = SamplingProfiler(
+    output_dir=settings.PROFILE_DIR,
+    interval_ms=settings.PROFILE_INTERVAL_MS,
+)
@@ -1,54 +1,201 @@
 import redis
 import hashlib
 import json
+import threading
+from api.core.circuit_breaker import CircuitBreaker
 from hate_speech.config import settings
 
+# Bounded pool: callers wait at most REDIS_POOL_TIMEOUT for a free connection,
+# and connect/read failures surface within the socket timeouts.
+pool_kwargs = dict(
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    decode_responses=True,
+)
 if settings.REDIS_URL:
-    redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    connection_pool = redis.BlockingConnectionPool.from_url(settings.REDIS_URL, **pool_kwargs)
 else:
-    redis_client = redis.Redis(
+    connection_pool = redis.BlockingConnectionPool(
         host=settings.REDIS_HOST,
         port=settings.REDIS_PORT,
         db=settings.REDIS_DB,
         password=settings.REDIS_PASSWORD,
-        ssl=settings.REDIS_SSL,
-        decode_responses=True,
+        connection_class=redis.SSLConnection if settings.REDIS_SSL else redis.Connection,
+        **pool_kwargs,
     )
+redis_client = redis.Redis(connection_pool=connection_pool)
+
+redis_breaker = CircuitBreaker(
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    cooldown_seconds=settings.REDIS_BREAKER_COOLDOWN_SECONDS,
+)
+
+
+class RedisUnavailable(redis.RedisError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+class RedisPoolExhausted(redis.RedisError):
+    """No pooled connection became free within REDIS_POOL_TIMEOUT."""
+
+
+# Message BlockingConnectionPool uses when checkout times out.
+_POOL_TIMEOUT_MESSAGE = "No connection available"
+_pool_timeouts = 0
+_pool_timeouts_lock = threading.Lock()
+
+
+def _call(fn, *args, **kwargs):
+    """
+    Runs a Redis command through the circuit breaker. Only connectivity
+    failures count towards opening it; command errors do not, and neither
+    does waiting too long for a local pool connection: that is saturation
+    in this process, not Redis being down, so the call is just skipped.
+    """
+    global _pool_timeouts
+    if not redis_breaker.allow():
+        raise RedisUnavailable("Redis circuit breaker is open")
+    try:
+        result = fn(*args, **kwargs)
+    except redis.ConnectionError as exc:
+        if _POOL_TIMEOUT_MESSAGE in str(exc):
+            redis_breaker.record_skipped()
+            with _pool_timeouts_lock:
+                _pool_timeouts += 1
+            raise RedisPoolExhausted(str(exc)) from exc
+        redis_breaker.record_failure()
+        raise
+    except redis.TimeoutError:
+        redis_breaker.record_failure()
+        raise
+    except redis.RedisError:
+        redis_breaker.record_success()
+        raise
+    redis_breaker.record_success()
+    return result
+
+def redis_health():
+    return {
+        "breaker": redis_breaker.stats(),
+        "pool_max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "pool_timeouts": _pool_timeouts,
+    }
+
+PREDICTION_KEY_PREFIX = "hate_pred"
 
 def text_hash(text: str):
     return hashlib.sha256(text.lower().strip().encode()).hexdigest()
 
+def _override_key(text: str):
+    return f"hate_override:{text_hash(text)}"
+
 def get_override(text: str):
-    key = f"hate_override:{text_hash(text)}"
+    return get_overrides([text])[0]
+
+def get_overrides(texts):
+    """
+    Resolves overrides for many texts with a single MGET round trip.
+    Returns one entry per input text (None where there is no override).
+    """
+    if not texts:
+        return []
+    keys = [_override_key(t) for t in texts]
+    unique_keys = list(dict.fromkeys(keys))
     try:
-        data = redis_client.get(key)
-        if data:
-            return json.loads(data)
-    except (redis.RedisError, json.JSONDecodeError, TypeError):
+        values = _call(redis_client.mget, unique_keys)
+    except redis.RedisError:
         # Gracefully degrade when Redis is unavailable.
-        return None
-    return None
+        return [None] * len(texts)
+
+    overrides = {}
+    for key, data in zip(unique_keys, values):
+        if not data:
+            continue
+        try:
+            overrides[key] = json.loads(data)
+        except (json.JSONDecodeError, TypeError):
+            continue
+    return [overrides.get(key) for key in keys]
 
 def set_override(text: str, label: str, moderator="system"):
-    key = f"hate_override:{text_hash(text)}"
+    key = _override_key(text)
     value = json.dumps({
         "label": label,
         "source": "human_override",
         "moderator": moderator
     })
     try:
-        redis_client.set(key, value)
+        _call(redis_client.set, key, value)
+    except redis.RedisError:
+        # Ignore cache-store failures; DB feedback still persists.
+        pass
+
+def set_overrides(items):
+    """
+    Writes many (text, label, moderator) overrides in one pipeline round trip.
+    """
+    if not items:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for text, label, moderator in items:
+            pipe.set(_override_key(text), json.dumps({
+                "label": label,
+                "source": "human_override",
+                "moderator": moderator
+            }))
+        _call(pipe.execute)
     except redis.RedisError:
         # Ignore cache-store failures; DB feedback still persists.
         pass
 
-def clear_prediction_cache():
+def get_cached_prediction(key: str):
+    try:
+        data = _call(redis_client.get, key)
+        if data:
+            return json.loads(data)
+    except (redis.RedisError, json.JSONDecodeError, TypeError):
+        return None
+    return None
+
+def get_cached_predictions(keys):
     """
-    Clears all cached prediction results.
-    Safe to call after model reload.
+    Fetches many cached predictions with a single MGET round trip.
+    Returns one entry per key (None on a miss or when Redis is unavailable).
     """
-    # OPTION 1: Clear everything (simple & safe for now)
+    if not keys:
+        return []
     try:
-        redis_client.flushdb()
+        values = _call(redis_client.mget, keys)
     except redis.RedisError:
-        pass
\ No newline at end of file
+        return [None] * len(keys)
+
+    results = []
+    for data in values:
+        try:
+            results.append(json.loads(data) if data else None)
+        except (json.JSONDecodeError, TypeError):
+            results.append(None)
+    return results
+
+def set_cached_prediction(key: str, value: dict, ttl_seconds: int):
+    try:
+        _call(redis_client.set, key, json.dumps(value), ex=ttl_seconds)
+    except (redis.RedisError, TypeError):
+        pass
+
+def set_cached_predictions(items, ttl_seconds: int):
+    """
+    Writes many (key, value) predictions in one pipeline round trip.
+    """
+    if not items:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, value in items:
+            pipe.set(key, json.dumps(value), ex=ttl_seconds)
+        _call(pipe.execute)
+    except (redis.RedisError, TypeError):
+        pass
@@ -0,0 +1,180 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+Record = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+DEFAULT_MAX_RECORD_CHARS = 64_000
+
+
+def _too_long(max_chars: int) -> str:
+    return f"line longer than {max_chars} characters"
+
+
+async def iter_lines(
+    byte_stream: AsyncIterator[bytes], max_line_chars: int = DEFAULT_MAX_RECORD_CHARS
+) -> AsyncIterator[Optional[str]]:
+    """
+    Decodes an async byte stream into lines without buffering the whole body.
+
+    Only the unterminated tail of the current line is kept between chunks,
+    and each chunk is split once. A line longer than `max_line_chars` is
+    yielded as None, once, and the rest of it is discarded up to the next
+    newline, so memory stays bounded however long a line is.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending: List[str] = []
+    pending_chars = 0
+    skipping = False
+    async for chunk in byte_stream:
+        *lines, tail = decoder.decode(chunk).split("\n")
+        for line in lines:
+            if skipping:
+                # This newline ends the oversized line already reported.
+                skipping = False
+            elif pending_chars + len(line) > max_line_chars:
+                yield None
+            else:
+                pending.append(line)
+                yield "".join(pending).rstrip("\r")
+            pending, pending_chars = [], 0
+        if skipping:
+            continue
+        pending.append(tail)
+        pending_chars += len(tail)
+        if pending_chars > max_line_chars:
+            yield None
+            pending, pending_chars, skipping = [], 0, True
+
+    if skipping:
+        return
+    tail = decoder.decode(b"", final=True)
+    if pending_chars + len(tail) > max_line_chars:
+        yield None
+    elif pending_chars or tail:
+        pending.append(tail)
+        yield "".join(pending).rstrip("\r")
+
+
+async def iter_jsonl_records(
+    byte_stream: AsyncIterator[bytes],
+    text_field: str,
+    id_field: str,
+    max_record_chars: int = DEFAULT_MAX_RECORD_CHARS,
+) -> AsyncIterator[Record]:
+    """
+    Yields (id, text, error) per non-empty JSONL line. Lines longer than
+    `max_record_chars` are reported as errors without being buffered.
+    """
+    row = 0
+    async for line in iter_lines(byte_stream, max_record_chars):
+        if line is None:
+            row += 1
+            yield str(row), None, _too_long(max_record_chars)
+            continue
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            yield str(row), None, "invalid JSON"
+            continue
+        if not isinstance(obj, dict):
+            yield str(row), None, "expected a JSON object"
+            continue
+        record_id = obj.get(id_field, row)
+        text = obj.get(text_field)
+        if not isinstance(text, str):
+            yield str(record_id), None, f"missing '{text_field}'"
+            continue
+        yield str(record_id), text, None
+
+
+def _scan_quotes(line: str, in_quotes: bool) -> bool:
+    """
+    Returns whether a quoted field is still open after `line`, following the
+    default csv dialect: a quote only opens a field at the start of that
+    field, and `""` inside a quoted field is an escaped quote. Stray quotes
+    inside unquoted fields (`it"s`) are ordinary characters.
+    """
+    field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if in_quotes:
+            if c == '"':
+                if i + 1 < len(line) and line[i + 1] == '"':
+                    i += 1
+                else:
+                    in_quotes = False
+        elif c == '"' and field_start:
+            in_quotes = True
+        field_start = c == "," and not in_quotes
+        i += 1
+    return in_quotes
+
+
+async def iter_csv_records(
+    byte_stream: AsyncIterator[bytes],
+    text_field: str,
+    id_field: str,
+    max_record_chars: int = DEFAULT_MAX_RECORD_CHARS,
+) -> AsyncIterator[Record]:
+    """
+    Yields (id, text, error) per CSV row; the first row is the header.
+    Quoted fields may span lines. A line or a record still open after
+    `max_record_chars` is reported as an error and dropped, so an
+    unterminated quote cannot swallow the rest of the upload.
+    """
+    header = None
+    buffer = []
+    buffered = 0
+    in_quotes = False
+    row = 0
+    async for line in iter_lines(byte_stream, max_record_chars):
+        if line is None:
+            if header is None and not in_quotes:
+                yield None, None, "CSV header " + _too_long(max_record_chars)
+                return
+            row += 1
+            yield str(row), None, _too_long(max_record_chars)
+            buffer, buffered, in_quotes = [], 0, False
+            continue
+        buffer.append(line)
+        buffered += len(line) + 1
+        in_quotes = _scan_quotes(line, in_quotes)
+        if in_quotes:
+            if buffered <= max_record_chars:
+                continue
+            row += 1
+            yield str(row), None, f"quoted field longer than {max_record_chars} characters"
+            buffer, buffered, in_quotes = [], 0, False
+            continue
+
+        joined = "\n".join(buffer)
+        buffer, buffered = [], 0
+        if not joined.strip():
+            continue
+
+        values = next(csv.reader([joined]))
+        if header is None:
+            header = values
+            if text_field not in header:
+                yield None, None, f"CSV header has no '{text_field}' column"
+                return
+            continue
+
+        row += 1
+        record = dict(zip(header, values))
+        record_id = record.get(id_field) or str(row)
+        text = record.get(text_field)
+        if text is None:
+            yield record_id, None, f"missing '{text_field}'"
+            continue
+        yield record_id, text, None
+
+    if buffer:
+        yield str(row + 1), None, "unterminated quoted field"
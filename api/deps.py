@@ -1,8 +1,10 @@
-from typing import Generator
+import secrets
+from typing import Generator, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException, status
 
 from db.session import SessionLocal
+from hate_speech.config import settings
 from hate_speech.inference import InferenceService
 
 
@@ -20,3 +22,14 @@ inference_service = InferenceService()
 
 def get_inference_service() -> InferenceService:
     return inference_service
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    # Admin endpoints stay hidden unless ADMIN_TOKEN is configured.
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token.",
+        )
@@ -1,13 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from hate_speech.config import settings
-from db.base import Base
+from hate_speech.metrics import registry
+from hate_speech.runtime import freeze_for_fork
+from db.migrations import run_migrations
 from db.session import engine
 from .routes import retrain
 from .deps import inference_service
+from .core.executor import predict_executor
+from .core.feedback_writer import feedback_writer
+from .core.metrics import CONTENT_TYPE, MetricsMiddleware, register_api_metrics
+from .core.prediction_cache import prediction_cache
+from .core.redis_client import redis_health
 
 
-from .routes import prediction, feedback, dashboard_api
+from .routes import prediction, feedback, dashboard_api, debug
 
 
 def create_app() -> FastAPI:
@@ -28,10 +36,22 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", "X-Last-Id", "Server-Timing"],
     )
 
-    # Create DB tables
-    Base.metadata.create_all(bind=engine)
+    app.add_middleware(MetricsMiddleware)
+    register_api_metrics(inference_service)
+
+    # Create DB tables, indexes and dashboard counters
+    run_migrations(engine)
+
+    if settings.PRELOAD_MODEL:
+        inference_service.preload()
+        freeze_for_fork()
+
+    # A reload (from /retrain or the MODEL_DIR watcher) makes local entries
+    # unreachable; drop them instead of waiting for LRU eviction.
+    inference_service.add_reload_listener(prediction_cache.clear_local)
 
     app.include_router(
         prediction.router, prefix=settings.API_PREFIX
@@ -40,6 +60,10 @@ def create_app() -> FastAPI:
         feedback.router, prefix=settings.API_PREFIX
     )
 
+    app.include_router(
+        debug.router, prefix=settings.API_PREFIX
+    )
+
     app.include_router(dashboard_api.router)
 
     app.include_router(retrain.router)
@@ -51,8 +75,27 @@ def create_app() -> FastAPI:
             "version": settings.VERSION,
             "model_dir": settings.MODEL_DIR,
             "inference": inference_service.readiness(),
+            "prediction_cache": prediction_cache.stats(),
+            "predict_executor": predict_executor.stats(),
+            "redis": redis_health(),
+            "feedback_write_behind": feedback_writer.stats(),
         }
 
+    @app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+    def metrics() -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+    @app.on_event("startup")
+    def watch_model_dir() -> None:
+        # Runs in each worker after fork, so every worker follows MODEL_DIR.
+        inference_service.watch_model_dir(settings.MODEL_WATCH_INTERVAL_SECONDS)
+
+    @app.on_event("shutdown")
+    def flush_feedback() -> None:
+        # Drain queued write-behind feedback before the worker exits.
+        feedback_writer.close()
+        inference_service.stop_watching()
+
 
     return app
 
@@ -1,5 +1,10 @@
-from fastapi import APIRouter, Depends
+import hashlib
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
+from db.counters import apply_deltas, feedback_deltas, read_counters
 from db.models import Feedback
 from api.deps import get_db
 
@@ -8,33 +13,50 @@ router = APIRouter(prefix="/api/v1/dashboard", tags=["Dashboard"])
 
 @router.get("/stats")
 def get_stats(db: Session = Depends(get_db)):
-
-    total = db.query(Feedback).count()
-
-    model_errors = db.query(Feedback).filter(
-        Feedback.correct_label.isnot(None),
-        Feedback.correct_label != Feedback.predicted_label
-    ).count()
-
-    # if you don’t yet store override flag — return 0
-    overrides = 0
+    # Maintained incrementally on every insert/delete, so this is a 3-row read.
+    counters = read_counters(db)
 
     return {
-        "total_feedback": total,
-        "model_errors": model_errors,
-        "overrides": overrides
+        "total_feedback": counters["total_feedback"],
+        "model_errors": counters["model_errors"],
+        "overrides": counters["overrides"]
     }
 
 
 @router.get("/list")
-def get_list(limit: int = 200, db: Session = Depends(get_db)):
-
-    rows = (
-        db.query(Feedback)
-        .order_by(Feedback.id.desc())
-        .limit(limit)
-        .all()
+def get_list(
+    request: Request,
+    response: Response,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    since_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Feedback rows, newest first, paginated by id.
+
+    - `cursor`: return rows with id < cursor (use `X-Next-Cursor` from the previous page)
+    - `since_id`: delta mode, rows with id > since_id, oldest first
+    Responses carry an ETag; a matching If-None-Match returns 304.
+    """
+    # Column projection only: skips the preprocessing/metadata JSON blobs.
+    query = db.query(
+        Feedback.id,
+        Feedback.text,
+        Feedback.predicted_label,
+        Feedback.correct_label,
+        Feedback.predicted_confidence,
+        Feedback.created_at,
+        Feedback.model_version,
     )
+    if since_id is not None:
+        query = query.filter(Feedback.id > since_id).order_by(Feedback.id.asc())
+    else:
+        if cursor is not None:
+            query = query.filter(Feedback.id < cursor)
+        query = query.order_by(Feedback.id.desc())
+
+    rows = query.limit(limit).all()
 
     data = []
 
@@ -45,12 +67,30 @@ def get_list(limit: int = 200, db: Session = Depends(get_db)):
             "model_label": r.predicted_label or "",
             "correct_label": r.correct_label,
             "confidence": float(r.predicted_confidence) if r.predicted_confidence is not None else None,
-            "timestamp": None,   # placeholder until we add timestamp
+            "timestamp": r.created_at.isoformat() if r.created_at else None,
             "model_version": r.model_version or "",
         })
 
+    ids = [r.id for r in rows]
+    headers = {"ETag": _etag(data)}
+    if ids:
+        headers["X-Last-Id"] = str(max(ids))
+    elif since_id is not None:
+        headers["X-Last-Id"] = str(since_id)
+    if since_id is None and len(rows) == limit:
+        headers["X-Next-Cursor"] = str(min(ids))
+
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
     return data
 
+
+def _etag(data) -> str:
+    digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    return f'"{digest}"'
+
 from fastapi import HTTPException
 
 @router.delete("/delete/{feedback_id}")
@@ -61,6 +101,7 @@ def delete_feedback(feedback_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Feedback not found")
 
     db.delete(feedback)
+    apply_deltas(db, feedback_deltas(feedback.predicted_label, feedback.correct_label, sign=-1))
     db.commit()
 
     return {"status": "deleted", "id": feedback_id}
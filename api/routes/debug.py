@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from api.core.profiler import profiler
+from hate_speech.config import settings
+
+from ..deps import require_admin
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.post("/profile")
+def arm_profiler(
+    requests: int = Query(10, ge=1, le=settings.PROFILE_MAX_REQUESTS),
+):
+    """
+    Samples the next `requests` predict requests handled by this worker and
+    writes a collapsed-stack profile to PROFILE_DIR when they complete.
+    """
+    profiler.arm(requests)
+    return profiler.stats()
+
+
+@router.delete("/profile")
+def disarm_profiler():
+    profiler.disarm()
+    return profiler.stats()
+
+
+@router.get("/profile")
+def profiler_status():
+    return profiler.stats()
+
+
+@router.get("/profile/latest")
+def latest_profile():
+    path = profiler.stats()["last_profile"]
+    if not path or not Path(path).exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profile has been written yet.",
+        )
+    return FileResponse(path, media_type="text/plain", filename=Path(path).name)
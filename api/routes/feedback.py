@@ -1,51 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from api.core.redis_client import set_override
+from api.core.feedback_writer import bulk_insert_feedback, feedback_writer
+from api.core.redis_client import set_override, set_overrides
 from api.core.label_utils import normalize_label
+from hate_speech.config import settings
 
+from db.counters import apply_deltas, feedback_deltas
 from db.models import Feedback
-from ..schemas import FeedbackCreate, FeedbackResponse
+from ..schemas import (
+    FeedbackBulkCreate,
+    FeedbackBulkResponse,
+    FeedbackCreate,
+    FeedbackResponse,
+)
 from ..deps import get_db
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
 
-@router.post("/", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
-def create_feedback(
-    payload: FeedbackCreate,
-    db: Session = Depends(get_db),
-):
+def _validated_row(payload: FeedbackCreate, prefix: str = "") -> Dict:
+    """
+    Validates and normalizes one feedback payload into Feedback column values.
+    """
     if not payload.text.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Text cannot be empty.",
+            detail=f"{prefix}Text cannot be empty.",
         )
 
     predicted_label = normalize_label(payload.predicted_label)
     if predicted_label is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="predicted_label must be one of: hate, offensive, not_hate",
+            detail=f"{prefix}predicted_label must be one of: hate, offensive, not_hate",
         )
 
     correct_label = normalize_label(payload.correct_label) if payload.correct_label else None
     if payload.correct_label and correct_label is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="correct_label must be one of: hate, offensive, not_hate",
+            detail=f"{prefix}correct_label must be one of: hate, offensive, not_hate",
         )
 
-    fb = Feedback(
-        text=payload.text,
-        predicted_label=predicted_label,
-        predicted_confidence=payload.predicted_confidence,
-        correct_label=correct_label,
-        model_version=payload.model_version,
-        moderator_id=payload.moderator_id,
-        notes=payload.notes,
-        preprocessing=payload.preprocessing,
-        metadata_features=payload.metadata_features,
-    )
+    return {
+        "text": payload.text,
+        "predicted_label": predicted_label,
+        "predicted_confidence": payload.predicted_confidence,
+        "correct_label": correct_label,
+        "model_version": payload.model_version,
+        "moderator_id": payload.moderator_id,
+        "notes": payload.notes,
+        "preprocessing": payload.preprocessing,
+        "metadata_features": payload.metadata_features,
+    }
+
+
+@router.post("/", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
+def create_feedback(
+    payload: FeedbackCreate,
+    db: Session = Depends(get_db),
+):
+    fb = Feedback(**_validated_row(payload))
     if fb.correct_label:
         set_override(
             text=fb.text,
@@ -54,6 +71,38 @@ def create_feedback(
         )
 
     db.add(fb)
+    apply_deltas(db, feedback_deltas(fb.predicted_label, fb.correct_label))
     db.commit()
     db.refresh(fb)
     return fb
+
+
+@router.post("/bulk", response_model=FeedbackBulkResponse, status_code=status.HTTP_201_CREATED)
+def create_feedback_bulk(
+    payload: FeedbackBulkCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    if len(payload.items) > settings.FEEDBACK_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.FEEDBACK_BULK_MAX_ITEMS} items per request.",
+        )
+
+    rows = [
+        _validated_row(item, prefix=f"items[{i}]: ")
+        for i, item in enumerate(payload.items)
+    ]
+
+    set_overrides([
+        (row["text"], row["correct_label"], row["moderator_id"] or "unknown")
+        for row in rows
+        if row["correct_label"]
+    ])
+
+    if settings.FEEDBACK_WRITE_BEHIND and feedback_writer.enqueue(rows):
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"accepted": len(rows), "queued": True}
+
+    bulk_insert_feedback(db, rows, chunk_size=settings.FEEDBACK_BULK_CHUNK_SIZE)
+    return {"accepted": len(rows), "queued": False}
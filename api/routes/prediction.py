@@ -1,37 +1,165 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from api.core.redis_client import get_override
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from api.core.executor import QueueFullError, predict_executor
+from api.core.prediction_cache import prediction_cache
+from api.core.profiler import profiler
+from api.core.redis_client import get_overrides
+from api.core.stream_parsing import Record, iter_csv_records, iter_jsonl_records
 from api.core.label_utils import normalize_label
 from hate_speech.config import settings
 from hate_speech.inference import InferenceService
+from hate_speech.metrics import stage_timer, trace_stages
 
-from ..schemas import PredictRequest, PredictResponse
+from ..schemas import (
+    BatchPredictRequest,
+    BatchPredictResponse,
+    PredictRequest,
+    PredictResponse,
+)
 from ..deps import get_inference_service
 
 router = APIRouter(prefix="/predict", tags=["prediction"])
 
 
-@router.post("/", response_model=PredictResponse)
-def predict(
-    request: PredictRequest,
-    service: InferenceService = Depends(get_inference_service),
-):  
-    override = get_override(request.text)
+def _override_result(override: Optional[Dict]) -> Optional[Dict]:
+    if not override:
+        return None
 
-    if override:
-        override_label = normalize_label(override.get("label"))
-        if override_label is None:
-            override = None
+    override_label = normalize_label(override.get("label"))
+    if override_label is None:
+        return None
+
+    return {
+        "label": override_label,
+        "confidence": 1.0,
+        "probabilities": {
+            "not_hate": 1.0 if override_label == "not_hate" else 0.0,
+            "offensive": 1.0 if override_label == "offensive" else 0.0,
+            "hate": 1.0 if override_label == "hate" else 0.0,
+        },
+    }
+
+
+def _override_responses(texts: List[str]) -> List[Optional[Dict]]:
+    with stage_timer("override_lookup"):
+        overrides = get_overrides(texts)
+    return [_override_result(o) for o in overrides]
+
+
+def _override_response(text: str) -> Optional[Dict]:
+    return _override_responses([text])[0]
 
+
+def _to_response(result: Dict, include_metadata: bool) -> PredictResponse:
+    return PredictResponse(
+        label=result["label"],
+        confidence=result["confidence"],
+        probabilities=result["probabilities"],
+        preprocessing=result["preprocessing"] if include_metadata else None,
+        metadata_features=result["metadata_features"] if include_metadata else None,
+        model_version=result.get("model_version"),
+    )
+
+
+def _predict_cached(
+    service: InferenceService,
+    texts: List[str],
+    include_embedding: bool,
+    direct: bool = False,
+) -> List[Dict]:
+    """
+    Serves texts from the prediction cache where possible and runs the rest
+    through the model. Embedding requests bypass the cache. Batches read
+    and write Redis in one round trip each.
+    """
+    namespace = service.cache_namespace()
+    results: List[Optional[Dict]] = [None] * len(texts)
+    if not include_embedding:
+        with stage_timer("cache_lookup"):
+            if len(texts) == 1:
+                results = [prediction_cache.get(namespace, texts[0])]
+            else:
+                results = prediction_cache.get_many(namespace, texts)
+
+    pending = [i for i, r in enumerate(results) if r is None]
+    if not pending:
+        return results
+
+    if len(texts) == 1:
+        predictions = [
+            service.predict(texts[0], include_embedding=include_embedding, direct=direct)
+        ]
+    else:
+        predictions = service.predict_batch(
+            [texts[i] for i in pending], include_embedding=include_embedding
+        )
+
+    entries = []
+    for i, result in zip(pending, predictions):
+        results[i] = result
+        if not include_embedding:
+            # A reload may have swapped models since `namespace` was read;
+            # file the result under the version that actually produced it.
+            entries.append(
+                (service.cache_namespace(result.get("model_version")), texts[i], result)
+            )
+    if len(entries) == 1:
+        prediction_cache.set(*entries[0])
+    else:
+        prediction_cache.set_many(entries)
+    return results
+
+
+async def _run_bounded(fn, *args):
+    try:
+        return await predict_executor.run(fn, *args)
+    except QueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Prediction queue is full, retry shortly.",
+            headers={"Retry-After": str(settings.PREDICT_RETRY_AFTER_SECONDS)},
+        ) from exc
+
+
+def _debug_requested(request: PredictRequest, http_request: Request) -> bool:
+    if not settings.DEBUG_TIMING_ENABLED:
+        return False
+    header = http_request.headers.get("x-debug-timing", "").lower()
+    return request.debug or header in ("1", "true", "yes")
+
+
+def _server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={ms}" for stage, ms in timings.items())
+
+
+def _predict_sync(request: PredictRequest, service: InferenceService, debug: bool = False):
+    """
+    With `debug`, stage timings are collected for this request only; traced
+    and profiled requests skip the micro-batcher so their work stays on this
+    thread.
+    """
+    started = time.perf_counter()
+    tracer = trace_stages() if debug else nullcontext()
+    with tracer as trace, profiler.profile_request() as profiled:
+        response = _predict_one(request, service, direct=debug or profiled)
+
+    if debug:
+        timings = {stage: round(sec * 1000, 3) for stage, sec in trace.items()}
+        timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+        response.timings = timings
+    return response
+
+
+def _predict_one(request: PredictRequest, service: InferenceService, direct: bool):
+    override = _override_response(request.text)
     if override:
-        return {
-            "label": override_label,
-            "confidence": 1.0,
-            "probabilities": {
-                "not_hate": 1.0 if override_label == "not_hate" else 0.0,
-                "offensive": 1.0 if override_label == "offensive" else 0.0,
-                "hate": 1.0 if override_label == "hate" else 0.0,
-            },
-        }
+        return PredictResponse(**override)
 
     if not request.text.strip():
         raise HTTPException(
@@ -40,22 +168,160 @@ def predict(
         )
 
     try:
-        result = service.predict(
-            text=request.text,
-            include_embedding=request.include_embedding,
-        )
+        result = _predict_cached(
+            service, [request.text], request.include_embedding, direct=direct
+        )[0]
     except RuntimeError as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         ) from exc
 
-    response = PredictResponse(
-        label=result["label"],
-        confidence=result["confidence"],
-        probabilities=result["probabilities"],
-        preprocessing=result["preprocessing"] if request.include_metadata else None,
-        metadata_features=result["metadata_features"] if request.include_metadata else None,
+    return _to_response(result, request.include_metadata)
+
+
+def _predict_batch_sync(request: BatchPredictRequest, service: InferenceService):
+    if len(request.texts) > settings.PREDICT_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PREDICT_BATCH_MAX_TEXTS} texts per batch.",
+        )
+
+    for text in request.texts:
+        if not text.strip() or len(text) > 1000:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each text must be non-empty and at most 1000 characters.",
+            )
+
+    results: list = _override_responses(request.texts)
+    pending = [i for i, r in enumerate(results) if r is None]
+
+    if pending:
+        try:
+            predictions = _predict_cached(
+                service,
+                [request.texts[i] for i in pending],
+                request.include_embedding,
+            )
+        except RuntimeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+            ) from exc
+
+        for i, result in zip(pending, predictions):
+            results[i] = _to_response(result, request.include_metadata)
+
+    return {"results": results}
+
+
+@router.post("/", response_model=PredictResponse)
+async def predict(
+    request: PredictRequest,
+    http_request: Request,
+    response: Response,
+    service: InferenceService = Depends(get_inference_service),
+):
+    debug = _debug_requested(request, http_request)
+    result = await _run_bounded(_predict_sync, request, service, debug)
+    if result.timings:
+        response.headers["Server-Timing"] = _server_timing(result.timings)
+    return result
+
+
+@router.post("/batch", response_model=BatchPredictResponse)
+async def predict_batch(
+    request: BatchPredictRequest,
+    service: InferenceService = Depends(get_inference_service),
+):
+    return await _run_bounded(_predict_batch_sync, request, service)
+
+
+def _classify_chunk(service: InferenceService, records: List[Record]) -> List[Dict]:
+    results: List[Optional[Dict]] = [None] * len(records)
+    valid = []
+    for i, (record_id, text, error) in enumerate(records):
+        if error is None and (not text.strip() or len(text) > settings.BULK_MAX_TEXT_CHARS):
+            error = f"text must be non-empty and at most {settings.BULK_MAX_TEXT_CHARS} characters"
+        if error is not None:
+            results[i] = {"id": record_id, "error": error}
+            continue
+        valid.append(i)
+
+    pending = []
+    overrides = _override_responses([records[i][1] for i in valid])
+    for i, override in zip(valid, overrides):
+        if override:
+            results[i] = {"id": records[i][0], **override, "source": "human_override"}
+            continue
+        pending.append(i)
+
+    if pending:
+        predictions = _predict_cached(service, [records[i][1] for i in pending], False)
+        for i, result in zip(pending, predictions):
+            results[i] = {
+                "id": records[i][0],
+                "label": result["label"],
+                "confidence": result["confidence"],
+                "probabilities": result["probabilities"],
+                "source": "model",
+                "model_version": result.get("model_version"),
+            }
+    return results
+
+
+async def _stream_results(
+    service: InferenceService, records: AsyncIterator[Record]
+) -> AsyncIterator[str]:
+    async def emit(chunk: List[Record]) -> List[Dict]:
+        # A stream cannot be answered with 503 halfway through, so wait for capacity.
+        while True:
+            try:
+                return await predict_executor.run(_classify_chunk, service, chunk)
+            except QueueFullError:
+                await asyncio.sleep(settings.PREDICT_RETRY_AFTER_SECONDS)
+
+    chunk: List[Record] = []
+    try:
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= settings.BULK_CHUNK_SIZE:
+                for result in await emit(chunk):
+                    yield json.dumps(result) + "\n"
+                chunk = []
+        if chunk:
+            for result in await emit(chunk):
+                yield json.dumps(result) + "\n"
+    except RuntimeError as exc:
+        yield json.dumps({"error": str(exc)}) + "\n"
+
+
+@router.post("/stream")
+async def predict_stream(
+    request: Request,
+    input_format: Optional[str] = Query(None, alias="format"),
+    text_field: str = "text",
+    id_field: str = "id",
+    service: InferenceService = Depends(get_inference_service),
+):
+    """
+    Classifies an uploaded JSONL or CSV body and streams NDJSON results
+    back chunk by chunk, without buffering the input or the output.
+    """
+    if input_format is None:
+        content_type = request.headers.get("content-type", "")
+        input_format = "csv" if "csv" in content_type else "jsonl"
+    if input_format not in ("jsonl", "csv"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be one of: jsonl, csv",
+        )
+
+    parser = iter_csv_records if input_format == "csv" else iter_jsonl_records
+    records = parser(
+        request.stream(), text_field, id_field, max_record_chars=settings.STREAM_MAX_RECORD_CHARS
+    )
+    return StreamingResponse(
+        _stream_results(service, records), media_type="application/x-ndjson"
     )
-    return response
-    
\ No newline at end of file
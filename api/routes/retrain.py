@@ -6,7 +6,6 @@ import sys
 from pathlib import Path
 
 from api.deps import inference_service
-from api.core.redis_client import clear_prediction_cache
 from hate_speech.config import settings
 
 router = APIRouter(
@@ -42,11 +41,14 @@ def run_retraining(new_version: str):
             check=True,
         )
 
-        # Reload latest model after successful training
+        # Reload latest model after successful training. This only reloads the
+        # worker that ran the job; the others pick the new weights up through
+        # the MODEL_DIR watcher (MODEL_WATCH_INTERVAL_SECONDS).
         inference_service.reload(str(LATEST_MODEL_DIR))
 
-        # Clear prediction cache
-        clear_prediction_cache()
+        # No Redis sweep: other workers may still serve (and cache under) the
+        # old version until their watcher reloads. The new version gets its
+        # own key namespace, and old entries expire via their TTL.
 
     finally:
         if LOCK_FILE.exists():
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -7,6 +7,8 @@ class PredictRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=1000)
     include_embedding: bool = False
     include_metadata: bool = True
+    # Adds a per-stage timing breakdown (milliseconds) to the response
+    debug: bool = False
 
 
 class PredictResponse(BaseModel):
@@ -15,9 +17,22 @@ class PredictResponse(BaseModel):
     probabilities: Dict[str, float]
     preprocessing: Optional[Dict[str, Any]] = None
     metadata_features: Optional[Dict[str, Any]] = None
+    # Version of the model that produced the prediction; None for human overrides
+    model_version: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
     # embedding intentionally omitted from API response for size, but can be added
 
 
+class BatchPredictRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1)
+    include_embedding: bool = False
+    include_metadata: bool = True
+
+
+class BatchPredictResponse(BaseModel):
+    results: List[PredictResponse]
+
+
 class FeedbackCreate(BaseModel):
     text: str
     predicted_label: str
@@ -30,6 +45,15 @@ class FeedbackCreate(BaseModel):
     metadata_features: Optional[Dict[str, Any]] = None
 
 
+class FeedbackBulkCreate(BaseModel):
+    items: List[FeedbackCreate] = Field(..., min_length=1)
+
+
+class FeedbackBulkResponse(BaseModel):
+    accepted: int
+    queued: bool
+
+
 class FeedbackResponse(BaseModel):
     id: int
     text: str
@@ -0,0 +1,76 @@
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+COMPARED_ENVIRONMENT = ("processor", "cpu_count", "torch", "inference_backend", "model_dir")
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """
+    Matches results by name and flags those whose median slowed down by
+    more than `threshold` (a fraction, e.g. 0.15 for 15%).
+    """
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        base = previous.get(result["name"])
+        if base is None:
+            rows.append({"name": result["name"], "status": "new", "current_ms": result["median_ms"]})
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "name": result["name"],
+            "status": status,
+            "baseline_ms": base["median_ms"],
+            "current_ms": result["median_ms"],
+            "ratio": ratio,
+        })
+    return rows
+
+
+def print_report(rows: List[Dict], baseline: Dict, current: Dict, threshold: float) -> int:
+    base_env = baseline.get("environment", {})
+    cur_env = current.get("environment", {})
+    for key in COMPARED_ENVIRONMENT:
+        if base_env.get(key) != cur_env.get(key):
+            print(f"warning: {key} differs ({base_env.get(key)!r} -> {cur_env.get(key)!r}); timings may not be comparable")
+
+    print(f"{'benchmark':<60} {'baseline':>11} {'current':>11} {'change':>8}")
+    for row in rows:
+        if row["status"] == "new":
+            print(f"{row['name']:<60} {'-':>11} {row['current_ms']:9.3f}ms {'new':>8}")
+            continue
+        change = (row["ratio"] - 1) * 100
+        marker = {"regression": "  <-- slower", "improvement": "  faster"}.get(row["status"], "")
+        print(
+            f"{row['name']:<60} {row['baseline_ms']:9.3f}ms {row['current_ms']:9.3f}ms"
+            f" {change:+7.1f}%{marker}"
+        )
+
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {threshold:.0%}")
+        return 1
+    print(f"No regressions beyond {threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", type=str)
+    parser.add_argument("current", type=str)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    sys.exit(print_report(compare(baseline, current, args.threshold), baseline, current, args.threshold))
@@ -0,0 +1,249 @@
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import redis
+
+from hate_speech.batching import MicroBatcher
+from hate_speech.config import settings
+from hate_speech.model import LABEL_MAP
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the subset of redis.Redis the API uses.
+
+    Every command holds one of `max_connections` slots for `latency_ms`,
+    like a BlockingConnectionPool round trip, and fails with
+    ConnectionError after `pool_timeout` seconds without a free slot, so
+    pool exhaustion and the circuit breaker behave as they would in production.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        max_connections: int = settings.REDIS_MAX_CONNECTIONS,
+        pool_timeout: float = settings.REDIS_POOL_TIMEOUT,
+    ):
+        self.latency = latency_ms / 1000.0
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._data_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._stats_lock = threading.Lock()
+        self._commands = 0
+        self._in_use = 0
+        self._max_in_use = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._pool_timeouts = 0
+
+    @contextmanager
+    def _connection(self):
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            with self._stats_lock:
+                self._pool_timeouts += 1
+            raise redis.ConnectionError("No connection available.")
+        waited = time.monotonic() - start
+        with self._stats_lock:
+            self._commands += 1
+            self._in_use += 1
+            self._max_in_use = max(self._max_in_use, self._in_use)
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            yield
+        finally:
+            with self._stats_lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def _read(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _write(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (str(value), expires_at)
+
+    def ping(self) -> bool:
+        with self._connection():
+            return True
+
+    def get(self, key: str) -> Optional[str]:
+        with self._connection(), self._data_lock:
+            return self._read(key)
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        with self._connection(), self._data_lock:
+            return [self._read(k) for k in keys]
+
+    def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        with self._connection(), self._data_lock:
+            self._write(key, value, ex)
+        return True
+
+    def unlink(self, *keys: str) -> int:
+        with self._connection(), self._data_lock:
+            return sum(1 for k in keys if self._data.pop(k, None) is not None)
+
+    delete = unlink
+
+    def pipeline(self, transaction: bool = False) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "max_connections": self.max_connections,
+                "in_use": self._in_use,
+                "max_in_use": self._max_in_use,
+                "commands": self._commands,
+                "wait_avg_ms": (self._wait_total / self._commands * 1000) if self._commands else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+                "pool_timeouts": self._pool_timeouts,
+                "keys": len(self._data),
+            }
+
+
+class FakePipeline:
+    """
+    Buffers set() calls and applies them in one simulated round trip.
+    """
+
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self._ops: List[Tuple[str, str, Optional[int]]] = []
+
+    def set(self, key: str, value: str, ex: Optional[int] = None) -> "FakePipeline":
+        self._ops.append((key, value, ex))
+        return self
+
+    def execute(self) -> List[bool]:
+        with self.client._connection(), self.client._data_lock:
+            for key, value, ex in self._ops:
+                self.client._write(key, value, ex)
+        results = [True] * len(self._ops)
+        self._ops = []
+        return results
+
+
+class StubInferenceService:
+    """
+    Drop-in for InferenceService that returns canned predictions instead of
+    running the model.
+
+    Each forward pass costs `latency_ms` plus `per_item_ms` per text, spent
+    sleeping (GIL released, like torch kernels), and `gil_ms` per text spent
+    busy-waiting (GIL held, like spaCy preprocessing). Single predictions go
+    through the real MicroBatcher when micro-batching is enabled.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 20.0,
+        per_item_ms: float = 1.0,
+        gil_ms: float = 0.0,
+        micro_batching: bool = settings.ENABLE_MICRO_BATCHING,
+    ):
+        self.latency = latency_ms / 1000.0
+        self.per_item = per_item_ms / 1000.0
+        self.gil = gil_ms / 1000.0
+        self._lock = threading.Lock()
+        self._forward_passes = 0
+        self._texts = 0
+        self._batcher: Optional[MicroBatcher] = None
+        if micro_batching:
+            self._batcher = MicroBatcher(
+                self._predict_batch_loaded,
+                max_batch_size=settings.BATCH_MAX_SIZE,
+                max_wait_ms=settings.BATCH_MAX_WAIT_MS,
+            )
+
+    @staticmethod
+    def _result(text: str) -> Dict:
+        digest = hashlib.sha256(text.encode()).digest()
+        raw = [b + 1 for b in digest[:3]]
+        total = float(sum(raw))
+        probabilities = {LABEL_MAP[i]: raw[i] / total for i in range(3)}
+        label = max(probabilities, key=probabilities.get)
+        return {
+            "label": label,
+            "confidence": probabilities[label],
+            "probabilities": probabilities,
+            "preprocessing": {"normalized": text.lower(), "language": "en"},
+            "metadata_features": {"char_len": float(len(text))},
+            "embedding": None,
+            "model_version": "stub",
+        }
+
+    def _predict_batch_loaded(
+        self, texts: List[str], include_embedding: bool = False
+    ) -> List[Dict]:
+        if self.gil:
+            deadline = time.perf_counter() + self.gil * len(texts)
+            while time.perf_counter() < deadline:
+                pass
+        time.sleep(self.latency + self.per_item * len(texts))
+        with self._lock:
+            self._forward_passes += 1
+            self._texts += len(texts)
+        return [self._result(t) for t in texts]
+
+    @property
+    def model_version(self) -> str:
+        return "stub"
+
+    def cache_namespace(self, version: Optional[str] = None) -> str:
+        return version or "stub"
+
+    def preload(self) -> None:
+        pass
+
+    def predict(
+        self, text: str, include_embedding: bool = False, direct: bool = False
+    ) -> Dict:
+        if self._batcher is not None and not direct:
+            return self._batcher.submit(text, include_embedding=include_embedding)
+        return self._predict_batch_loaded([text], include_embedding)[0]
+
+    def predict_batch(
+        self, texts: List[str], include_embedding: bool = False
+    ) -> List[Dict]:
+        return self._predict_batch_loaded(texts, include_embedding)
+
+    def reload(self, new_model_dir: str, background: bool = False) -> None:
+        pass
+
+    def add_reload_listener(self, listener) -> None:
+        pass
+
+    def watch_model_dir(self, interval_seconds: float) -> None:
+        pass
+
+    def stop_watching(self) -> None:
+        pass
+
+    def readiness(self) -> Dict[str, Optional[str]]:
+        return {"ready": True, "error": None, "model_dir": "stub", "model_version": "stub"}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            passes, texts = self._forward_passes, self._texts
+        return {
+            "forward_passes": passes,
+            "texts": texts,
+            "mean_batch_size": texts / passes if passes else 0.0,
+        }
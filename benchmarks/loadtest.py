@@ -0,0 +1,325 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_MIX = "predict=60,predict_batch=10,feedback=15,feedback_bulk=2,dashboard_stats=8,dashboard_list=5"
+LABELS = ["not_hate", "offensive", "hate"]
+WORDS = (
+    "you people are so stupid and i hate this game lol why would anyone "
+    "post that video again the news today was really bad for everyone "
+    "my friends think it is great but honestly it is not worth the money "
+    "@user http://t.co/x #BadDay 😂 u lmao idk"
+).split()
+
+
+class Traffic:
+    """
+    Builds requests for each scenario. Texts are drawn from a fixed pool
+    with a heavy-tailed popularity, so repeated texts exercise the
+    prediction cache roughly like real traffic.
+    """
+
+    def __init__(self, distinct_texts: int, seed: int):
+        self.rng = random.Random(seed)
+        self.texts = [
+            " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(5, 60)))
+            for _ in range(distinct_texts)
+        ]
+
+    def text(self) -> str:
+        idx = int(self.rng.paretovariate(1.2)) - 1
+        return self.texts[idx % len(self.texts)]
+
+    def feedback_item(self) -> Dict:
+        return {
+            "text": self.text(),
+            "predicted_label": self.rng.choice(LABELS),
+            "predicted_confidence": round(self.rng.random(), 3),
+            "correct_label": self.rng.choice(LABELS) if self.rng.random() < 0.3 else None,
+            "moderator_id": "loadtest",
+        }
+
+    def request(self, scenario: str) -> Tuple[str, str, Optional[Dict]]:
+        if scenario == "predict":
+            return "POST", "/api/v1/predict/", {"text": self.text()}
+        if scenario == "predict_batch":
+            return "POST", "/api/v1/predict/batch", {"texts": [self.text() for _ in range(8)]}
+        if scenario == "feedback":
+            return "POST", "/api/v1/feedback/", self.feedback_item()
+        if scenario == "feedback_bulk":
+            return "POST", "/api/v1/feedback/bulk", {"items": [self.feedback_item() for _ in range(50)]}
+        if scenario == "dashboard_stats":
+            return "GET", "/api/v1/dashboard/stats", None
+        if scenario == "dashboard_list":
+            return "GET", "/api/v1/dashboard/list?limit=50", None
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if float(weight or 0) > 0:
+            names.append(name.strip())
+            weights.append(float(weight))
+    return names, weights
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def record(self, scenario: str, seconds: float, status: str) -> None:
+        if not self.recording:
+            return
+        self.latencies[scenario].append(seconds)
+        self.statuses[scenario][status] += 1
+
+    def summary(self, duration: float) -> Dict[str, Dict]:
+        routes = {}
+        for scenario, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            statuses = dict(self.statuses[scenario])
+            errors = sum(n for s, n in statuses.items() if not s.startswith(("2", "3")))
+            routes[scenario] = {
+                "requests": len(values),
+                "errors": errors,
+                "throughput_rps": len(values) / duration,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+                "statuses": statuses,
+            }
+        return routes
+
+
+# (label, path to "used", path to "capacity") within a /loadtest/stats sample
+RESOURCES = [
+    ("threadpool", ("threadpool", "borrowed"), ("threadpool", "total")),
+    ("predict_executor", ("predict_executor", "running"), ("predict_executor", "max_workers")),
+    ("db_pool", ("db_pool", "checkedout"), ("db_pool", "capacity")),
+    ("redis_pool", ("redis", "in_use"), ("redis", "max_connections")),
+]
+
+
+def _dig(sample: Dict, path: Tuple[str, ...]):
+    for key in path:
+        if not isinstance(sample, dict) or key not in sample:
+            return None
+        sample = sample[key]
+    return sample
+
+
+def saturation(samples: List[Dict]) -> Dict[str, Dict]:
+    """
+    Peak and share-of-time-at-capacity for each pool, plus queueing signals
+    (threadpool waiters, executor queue, 503 rejections, Redis pool waits).
+    """
+    report = {}
+    for name, used_path, cap_path in RESOURCES:
+        pairs = [(_dig(s, used_path), _dig(s, cap_path)) for s in samples]
+        pairs = [(u, c) for u, c in pairs if u is not None and c]
+        if not pairs:
+            continue
+        ratios = [u / c for u, c in pairs]
+        report[name] = {
+            "capacity": pairs[-1][1],
+            "peak_used": max(u for u, _ in pairs),
+            "mean_utilization": sum(ratios) / len(ratios),
+            "time_at_capacity": sum(1 for r in ratios if r >= 0.99) / len(ratios),
+        }
+
+    waiting = [_dig(s, ("threadpool", "waiting")) or 0 for s in samples]
+    queued = [_dig(s, ("predict_executor", "queue_depth")) or 0 for s in samples]
+    if samples:
+        report.setdefault("threadpool", {})["peak_waiting"] = max(waiting)
+        report.setdefault("predict_executor", {})["peak_queue_depth"] = max(queued)
+        last = samples[-1]
+        report["predict_executor"]["rejected"] = _dig(last, ("predict_executor", "rejected"))
+        report["predict_executor"]["wait_max_ms"] = _dig(last, ("predict_executor", "wait_max_ms"))
+        if _dig(last, ("redis", "in_use")) is not None:
+            report.setdefault("redis_pool", {}).update({
+                "wait_max_ms": _dig(last, ("redis", "wait_max_ms")),
+                "pool_timeouts": _dig(last, ("redis", "pool_timeouts")),
+            })
+        # The fake app reports the breaker at top level; /healthz nests it under redis.
+        breaker = _dig(last, ("redis_breaker",)) or _dig(last, ("redis", "breaker")) or {}
+        report["redis_breaker"] = {"state": breaker.get("state"), "trips": breaker.get("trips")}
+        if _dig(last, ("inference",)) and "forward_passes" in last["inference"]:
+            report["inference"] = last["inference"]
+    return report
+
+
+async def sample_stats(client: httpx.AsyncClient, interval: float, out: List[Dict], stop: asyncio.Event) -> None:
+    # /loadtest/stats exists on the fake app; a real deployment only has /healthz.
+    path = "/loadtest/stats"
+    while not stop.is_set():
+        try:
+            response = await client.get(path)
+            if response.status_code == 404 and path != "/healthz":
+                path = "/healthz"
+                continue
+            if response.status_code == 200:
+                out.append(response.json())
+        except httpx.HTTPError:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    traffic: Traffic,
+    mix: Tuple[List[str], List[float]],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    sample_interval: float,
+    timeout: float,
+) -> Tuple[Recorder, List[Dict], float]:
+    names, weights = mix
+    recorder = Recorder()
+    samples: List[Dict] = []
+    stop = asyncio.Event()
+    deadline = time.monotonic() + warmup + duration
+
+    async def worker() -> None:
+        while time.monotonic() < deadline:
+            scenario = traffic.rng.choices(names, weights)[0]
+            method, path, body = traffic.request(scenario)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body, timeout=timeout)
+                status = str(response.status_code)
+            except httpx.TimeoutException:
+                status = "timeout"
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            recorder.record(scenario, time.perf_counter() - start, status)
+
+    async def start_recording() -> None:
+        await asyncio.sleep(warmup)
+        recorder.recording = True
+
+    sampler = asyncio.create_task(sample_stats(client, sample_interval, samples, stop))
+    recording = asyncio.create_task(start_recording())
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started - warmup
+    stop.set()
+    await asyncio.gather(sampler, recording)
+    return recorder, samples, max(elapsed, 1e-9)
+
+
+def print_report(routes: Dict[str, Dict], saturation_report: Dict[str, Dict]) -> None:
+    print(f"{'route':<18} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, r in routes.items():
+        print(
+            f"{name:<18} {r['requests']:>7} {r['errors']:>5} {r['throughput_rps']:>8.1f}"
+            f" {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}"
+        )
+    print()
+    for name, r in saturation_report.items():
+        flag = "  <-- saturated" if r.get("time_at_capacity", 0) >= 0.5 else ""
+        details = ", ".join(
+            f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in r.items()
+        )
+        print(f"{name:<18} {details}{flag}")
+
+
+def make_client(url: Optional[str]) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if url:
+        return httpx.AsyncClient(base_url=url, limits=limits)
+
+    # In-process: the app shares this event loop, so client overhead counts
+    # against the server. Use --url with a separate uvicorn for cleaner numbers.
+    from .loadtest_app import app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://loadtest", limits=limits
+    )
+
+
+def set_fake_env(args) -> None:
+    os.environ["LOADTEST_MODEL_LATENCY_MS"] = str(args.model_latency_ms)
+    os.environ["LOADTEST_MODEL_PER_ITEM_MS"] = str(args.model_per_item_ms)
+    os.environ["LOADTEST_GIL_MS"] = str(args.gil_ms)
+    os.environ["LOADTEST_REDIS_LATENCY_MS"] = str(args.redis_latency_ms)
+
+
+async def main_async(args) -> Dict:
+    traffic = Traffic(args.distinct_texts, args.seed)
+    async with make_client(args.url) as client:
+        recorder, samples, elapsed = await run_load(
+            client,
+            traffic,
+            parse_mix(args.mix),
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            sample_interval=args.sample_interval,
+            timeout=args.timeout,
+        )
+    return {
+        "config": vars(args),
+        "duration_seconds": elapsed,
+        "routes": recorder.summary(elapsed),
+        "saturation": saturation(samples),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="API load test with a stub model and in-memory Redis")
+    parser.add_argument("--url", type=str, default=None, help="target a running server instead of in-process")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", type=str, default=DEFAULT_MIX)
+    parser.add_argument("--distinct-texts", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--sample-interval", type=float, default=0.25)
+    parser.add_argument("--model-latency-ms", type=float, default=20.0)
+    parser.add_argument("--model-per-item-ms", type=float, default=1.0)
+    parser.add_argument("--gil-ms", type=float, default=0.0, help="per-text busy wait holding the GIL")
+    parser.add_argument("--redis-latency-ms", type=float, default=0.5)
+    parser.add_argument("--output", type=str, default=None, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.url:
+        set_fake_env(args)
+
+    report = asyncio.run(main_async(args))
+    print_report(report["routes"], report["saturation"])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+api.main:app with the model and Redis replaced by in-process fakes.
+
+    LOADTEST_MODEL_LATENCY_MS=20 uvicorn benchmarks.loadtest_app:app
+
+Fake behaviour is configured with LOADTEST_* environment variables; the
+rest of the API (executor sizes, cache, micro-batching, DATABASE_URL) reads
+its usual settings.
+"""
+import os
+import tempfile
+
+# Settings are read at import time, so defaults must be in place first.
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.gettempdir(), 'hate_speech_loadtest.db')}",
+)
+os.environ.setdefault("PRELOAD_MODEL", "false")
+os.environ.setdefault("ENABLE_SENTENCE_BERT", "false")
+
+import anyio.to_thread
+from fastapi import FastAPI
+
+from api import deps
+from api.core import redis_client
+from .fakes import FakeRedis, StubInferenceService
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def db_pool_stats(engine) -> dict:
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    for name in ("size", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            stats[name] = fn()
+    # QueuePool allows size + max_overflow connections before callers block.
+    max_overflow = getattr(pool, "_max_overflow", None)
+    if "size" in stats and max_overflow is not None and max_overflow >= 0:
+        stats["capacity"] = stats["size"] + max_overflow
+    return stats
+
+
+def build_app() -> FastAPI:
+    fake_redis = FakeRedis(latency_ms=_env_float("LOADTEST_REDIS_LATENCY_MS", 0.5))
+    stub = StubInferenceService(
+        latency_ms=_env_float("LOADTEST_MODEL_LATENCY_MS", 20.0),
+        per_item_ms=_env_float("LOADTEST_MODEL_PER_ITEM_MS", 1.0),
+        gil_ms=_env_float("LOADTEST_GIL_MS", 0.0),
+    )
+
+    # Patch before api.main is imported: it binds deps.inference_service by name.
+    redis_client.redis_client = fake_redis
+    deps.inference_service = stub
+
+    from api.core.executor import predict_executor
+    from api.main import app
+    from db.session import engine
+
+    @app.get("/loadtest/stats", include_in_schema=False)
+    async def loadtest_stats() -> dict:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        return {
+            "threadpool": {
+                "total": limiter.total_tokens,
+                "borrowed": limiter.borrowed_tokens,
+                "waiting": limiter.statistics().tasks_waiting,
+            },
+            "predict_executor": predict_executor.stats(),
+            "db_pool": db_pool_stats(engine),
+            "redis": fake_redis.stats(),
+            "redis_breaker": redis_client.redis_breaker.stats(),
+            "inference": stub.stats(),
+        }
+
+    return app
+
+
+app = build_app()
@@ -0,0 +1,280 @@
+import os
+
+# Benchmarks must run offline; set before hate_speech reads its settings.
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+os.environ.setdefault("ENABLE_SENTENCE_BERT", "false")
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import torch
+
+from hate_speech.config import settings
+from hate_speech.features import FeatureExtractor
+from hate_speech.language import LanguageIdentifier
+from hate_speech.model import HateSpeechModel
+from hate_speech.preprocessing import PreprocessingConfig, TextPreprocessor
+
+from .compare import compare, print_report
+from .tiny_model import build_tiny_model
+
+# Text lengths in words
+TEXT_LENGTHS = {"short": 8, "medium": 40, "long": 120}
+BATCH_SIZES = [1, 8, 32, 64]
+
+WORDS = (
+    "you people are so stupid and i hate this game lol why would anyone "
+    "post that video again the news today was really bad for everyone "
+    "my friends think it is great but honestly it is not worth the money"
+).split()
+EXTRAS = ["@user123", "http://t.co/abc", "#BadDayEver", "#noFilter", "😂", "🔥", "u", "lmao", "idk", "2024"]
+
+
+def make_texts(count: int, words: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        tokens = [
+            rng.choice(EXTRAS) if rng.random() < 0.15 else rng.choice(WORDS)
+            for _ in range(words)
+        ]
+        texts.append(" ".join(tokens))
+    return texts
+
+
+def measure(
+    fn: Callable[[], object],
+    items: int,
+    repeats: int,
+    min_time: float,
+) -> Dict[str, float]:
+    """
+    Times `fn` like timeit: calibrates the loop count so each repeat runs
+    for at least `min_time` seconds, then reports per-call statistics.
+    """
+    fn()  # warm-up (lazy loads, allocator, caches)
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    per_call = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - start) / loops)
+
+    median = statistics.median(per_call)
+    return {
+        "loops": loops,
+        "repeats": repeats,
+        "min_ms": min(per_call) * 1000,
+        "median_ms": median * 1000,
+        "mean_ms": statistics.fmean(per_call) * 1000,
+        "stdev_ms": (statistics.stdev(per_call) if len(per_call) > 1 else 0.0) * 1000,
+        "per_item_ms": median * 1000 / items,
+        "items_per_sec": items / median if median > 0 else 0.0,
+    }
+
+
+def cycling(values: List):
+    """
+    Returns a zero-arg getter over `values`, so repeated calls see
+    different inputs rather than hitting per-text caches.
+    """
+    it = itertools.cycle(values)
+    return lambda: next(it)
+
+
+def cycling_batches(texts: List[str], batch_size: int):
+    return cycling([
+        texts[i:i + batch_size] for i in range(0, len(texts) - batch_size + 1, batch_size)
+    ])
+
+
+class Suite:
+    def __init__(self, repeats: int, min_time: float, only: Optional[str]):
+        self.repeats = repeats
+        self.min_time = min_time
+        self.only = only
+        self.results: List[Dict] = []
+
+    def bench(self, name: str, fn: Callable[[], object], items: int = 1, **params) -> None:
+        label = name + "".join(f"[{k}={v}]" for k, v in params.items())
+        if self.only and self.only not in label:
+            return
+        stats = measure(fn, items, self.repeats, self.min_time)
+        self.results.append({"name": label, "group": name, "params": params, **stats})
+        print(
+            f"{label:<60} median {stats['median_ms']:9.3f} ms"
+            f"  ({stats['items_per_sec']:10.1f} items/s)",
+            flush=True,
+        )
+
+
+def run_preprocessing(suite: Suite, pool_size: int) -> None:
+    preprocessor = TextPreprocessor(PreprocessingConfig())
+
+    for length, words in TEXT_LENGTHS.items():
+        # More distinct texts than the language-detection LRU holds, so
+        # preprocess measures real detection cost rather than cache hits.
+        next_text = cycling(make_texts(pool_size, words, seed=words))
+        suite.bench("normalize_text", lambda: preprocessor.normalize_text(next_text()), length=length)
+        suite.bench("preprocess", lambda: preprocessor.preprocess(next_text()), length=length)
+
+    texts = make_texts(pool_size, TEXT_LENGTHS["medium"], seed=1)
+    for batch_size in BATCH_SIZES:
+        next_batch = cycling_batches(texts, batch_size)
+        suite.bench(
+            "preprocess_batch",
+            lambda: preprocessor.preprocess_batch(next_batch(), n_process=1),
+            items=batch_size,
+            batch=batch_size,
+            length="medium",
+        )
+
+
+def run_language_detection(suite: Suite, pool_size: int) -> Dict:
+    identifier = LanguageIdentifier(
+        enabled=True,
+        min_chars=settings.LANGUAGE_DETECTION_MIN_CHARS,
+        cache_size=settings.LANGUAGE_DETECTION_CACHE_SIZE,
+        seed=settings.LANGUAGE_DETECTION_SEED,
+    )
+    for length, words in TEXT_LENGTHS.items():
+        texts = make_texts(pool_size, words, seed=100 + words)
+        next_text = cycling(texts)
+        # Uncached: what a never-seen text costs
+        suite.bench("language_detection", lambda: identifier._detect_uncached(next_text()), length=length, cached=False)
+        hot = texts[0]
+        identifier.detect(hot)
+        suite.bench("language_detection", lambda: identifier.detect(hot), length=length, cached=True)
+    return identifier.stats()
+
+
+def run_features(suite: Suite, pool_size: int) -> None:
+    extractor = FeatureExtractor(sentiment=settings.FEATURE_SENTIMENT)
+    for length, words in TEXT_LENGTHS.items():
+        next_text = cycling(make_texts(pool_size, words, seed=200 + words))
+        suite.bench("feature_extract", lambda: extractor.extract(next_text()), length=length)
+
+    texts = make_texts(pool_size, TEXT_LENGTHS["medium"], seed=2)
+    for batch_size in BATCH_SIZES:
+        next_batch = cycling_batches(texts, batch_size)
+        suite.bench(
+            "feature_extract_batch",
+            lambda: extractor.extract_batch(next_batch()),
+            items=batch_size,
+            batch=batch_size,
+            length="medium",
+        )
+
+
+def run_model(suite: Suite, model_dir: str, pool_size: int) -> None:
+    model = HateSpeechModel(model_dir, device="cpu")
+    for length, words in TEXT_LENGTHS.items():
+        next_text = cycling(make_texts(pool_size, words, seed=300 + words))
+        suite.bench("model_predict", lambda: model.predict(next_text()), length=length)
+
+        texts = make_texts(pool_size, words, seed=400 + words)
+        for batch_size in BATCH_SIZES:
+            next_batch = cycling_batches(texts, batch_size)
+            suite.bench(
+                "model_predict_batch",
+                lambda: model.predict_batch(next_batch()),
+                items=batch_size,
+                batch=batch_size,
+                length=length,
+            )
+
+
+def environment(model_dir: str) -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "model_dir": model_dir,
+        "inference_backend": settings.INFERENCE_BACKEND,
+        "feature_sentiment": settings.FEATURE_SENTIMENT,
+        "language_detection": settings.LANGUAGE_DETECTION_ENABLED,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline micro-benchmarks")
+    parser.add_argument("--output", type=str, default="benchmarks/results.json")
+    parser.add_argument("--baseline", type=str, default=None, help="compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before failing (0.15 = 15%%)")
+    parser.add_argument("--model-dir", type=str, default=None, help="benchmark a real model instead of the tiny random one")
+    parser.add_argument("--only", type=str, default=None, help="run benchmarks whose name contains this")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--quick", action="store_true", help="3 repeats of 0.05s, for smoke runs")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads (1 keeps runs comparable)")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeats, args.min_time = 3, 0.05
+    torch.set_num_threads(args.threads)
+
+    suite = Suite(args.repeats, args.min_time, args.only)
+    pool_size = settings.LANGUAGE_DETECTION_CACHE_SIZE + 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = args.model_dir or build_tiny_model(os.path.join(tmp, "tiny-distilbert"))
+        run_preprocessing(suite, pool_size)
+        language_stats = run_language_detection(suite, pool_size)
+        run_features(suite, pool_size)
+        run_model(suite, model_dir, pool_size)
+
+    report = {
+        "environment": environment(args.model_dir or "tiny-random-distilbert"),
+        "settings": {"repeats": args.repeats, "min_time": args.min_time, "threads": args.threads},
+        "language_detection": language_stats,
+        "results": suite.results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(suite.results)} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        return print_report(rows, baseline, report, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import torch
+from transformers import (
+    DistilBertConfig,
+    DistilBertForSequenceClassification,
+    DistilBertTokenizerFast,
+)
+
+VOCAB_FILE = Path(__file__).resolve().parent / "fixtures" / "vocab.txt"
+
+
+def build_tiny_model(output_dir: str, num_labels: int = 3, seed: int = 0) -> str:
+    """
+    Writes a randomly initialized two-layer DistilBERT and a WordPiece
+    tokenizer built from the local vocab fixture, so benchmarks never touch
+    the network. Predictions are meaningless; only the cost matters.
+    """
+    tokenizer = DistilBertTokenizerFast(vocab_file=str(VOCAB_FILE), do_lower_case=True)
+    config = DistilBertConfig(
+        vocab_size=tokenizer.vocab_size,
+        dim=64,
+        hidden_dim=256,
+        n_layers=2,
+        n_heads=2,
+        max_position_embeddings=512,
+        num_labels=num_labels,
+    )
+    torch.manual_seed(seed)
+    model = DistilBertForSequenceClassification(config)
+    model.eval()
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    model.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    return output_dir
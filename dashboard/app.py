@@ -5,6 +5,10 @@ import matplotlib.pyplot as plt
 
 
 API_BASE = "http://127.0.0.1:8000/api/v1/dashboard"
+# Rows shown in the table (same as the API's default page size)
+LIST_LIMIT = 200
+# Deltas never report deletions, so reload the full page this often
+FULL_REFRESH_EVERY = 10
 
 
 st.set_page_config(page_title="Hate Speech Moderation Dashboard")
@@ -12,16 +16,47 @@ st.set_page_config(page_title="Hate Speech Moderation Dashboard")
 st.title("🛡 Hate Speech Detection – Moderator Dashboard")
 
 
-@st.cache_data
+@st.cache_data(ttl=10)
 def fetch_stats():
     r = requests.get(f"{API_BASE}/stats")
     return r.json()
 
 
-@st.cache_data
-def fetch_feedback():
-    r = requests.get(f"{API_BASE}/list")
-    return pd.DataFrame(r.json())
+def fetch_feedback(total_feedback: int):
+    """
+    Full list on first load, then only rows newer than the last seen id.
+    The server answers 304 when nothing changed.
+
+    Deleted rows never show up in a delta, so the full page is reloaded
+    every FULL_REFRESH_EVERY polls and whenever the total count drops.
+    """
+    state = st.session_state
+    full_refresh = (
+        "feedback_rows" not in state
+        or state.polls_since_full >= FULL_REFRESH_EVERY
+        or total_feedback < state.last_total
+    )
+    state.last_total = total_feedback
+    if full_refresh:
+        r = requests.get(f"{API_BASE}/list", params={"limit": LIST_LIMIT})
+        state.feedback_rows = r.json()
+        state.last_id = int(r.headers.get("X-Last-Id", 0))
+        state.delta_etag = None
+        state.polls_since_full = 0
+    else:
+        state.polls_since_full += 1
+        headers = {"If-None-Match": state.delta_etag} if state.delta_etag else {}
+        r = requests.get(
+            f"{API_BASE}/list", params={"since_id": state.last_id}, headers=headers
+        )
+        if r.status_code == 200:
+            new_rows = r.json()
+            # Delta rows arrive oldest first; the table shows newest first.
+            state.feedback_rows = (list(reversed(new_rows)) + state.feedback_rows)[:LIST_LIMIT]
+            state.last_id = int(r.headers.get("X-Last-Id", state.last_id))
+            state.delta_etag = r.headers.get("ETag")
+
+    return pd.DataFrame(state.feedback_rows)
 
 
 stats = fetch_stats()
@@ -38,7 +73,7 @@ col3.metric("Overrides Applied", stats["overrides"])
 
 st.subheader("📝 Recent Feedback")
 
-df = fetch_feedback()
+df = fetch_feedback(stats["total_feedback"])
 
 st.dataframe(df, use_container_width=True)
 
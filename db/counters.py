@@ -0,0 +1,52 @@
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .models import FeedbackCounter
+
+COUNTER_NAMES = ("total_feedback", "model_errors", "overrides")
+
+
+def feedback_deltas(
+    predicted_label: str, correct_label: Optional[str], sign: int = 1
+) -> Dict[str, int]:
+    """
+    Counter changes caused by inserting (sign=1) or deleting (sign=-1) one row.
+    """
+    has_correction = correct_label is not None
+    return {
+        "total_feedback": sign,
+        "model_errors": sign if has_correction and correct_label != predicted_label else 0,
+        "overrides": sign if has_correction else 0,
+    }
+
+
+def sum_deltas(rows: Iterable[Dict], sign: int = 1) -> Dict[str, int]:
+    totals = dict.fromkeys(COUNTER_NAMES, 0)
+    for row in rows:
+        for name, delta in feedback_deltas(
+            row["predicted_label"], row.get("correct_label"), sign
+        ).items():
+            totals[name] += delta
+    return totals
+
+
+def apply_deltas(db: Session, deltas: Dict[str, int]) -> None:
+    """
+    Adds deltas with atomic `value = value + delta` updates; the caller commits.
+    """
+    for name, delta in deltas.items():
+        if delta:
+            db.execute(
+                update(FeedbackCounter)
+                .where(FeedbackCounter.name == name)
+                .values(value=FeedbackCounter.value + delta)
+            )
+
+
+def read_counters(db: Session) -> Dict[str, int]:
+    counters = dict.fromkeys(COUNTER_NAMES, 0)
+    for row in db.query(FeedbackCounter.name, FeedbackCounter.value).all():
+        counters[row.name] = row.value
+    return counters
@@ -0,0 +1,50 @@
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .base import Base
+from .counters import COUNTER_NAMES
+from .models import Feedback, FeedbackCounter
+
+
+def create_feedback_indexes(engine: Engine) -> None:
+    # create_all never adds indexes to an existing table, so create them explicitly.
+    for index in Feedback.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def backfill_counters(engine: Engine) -> None:
+    """
+    Seeds the counters table from the feedback table once; afterwards the
+    counters are only maintained incrementally.
+    """
+    with Session(engine) as db:
+        existing = {name for (name,) in db.query(FeedbackCounter.name).all()}
+        missing = [name for name in COUNTER_NAMES if name not in existing]
+        if not missing:
+            return
+
+        corrected = Feedback.correct_label.isnot(None)
+        values = {
+            "total_feedback": db.scalar(select(func.count()).select_from(Feedback)),
+            "model_errors": db.scalar(
+                select(func.count()).select_from(Feedback).where(
+                    corrected, Feedback.correct_label != Feedback.predicted_label
+                )
+            ),
+            "overrides": db.scalar(select(func.count()).select_from(Feedback).where(corrected)),
+        }
+        for name in missing:
+            db.add(FeedbackCounter(name=name, value=values[name] or 0))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker seeded the counters first.
+            db.rollback()
+
+
+def run_migrations(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    create_feedback_indexes(engine)
+    backfill_counters(engine)
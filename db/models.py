@@ -10,9 +10,9 @@ class Feedback(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     text = Column(Text, nullable=False)
-    predicted_label = Column(String(50), nullable=False)
+    predicted_label = Column(String(50), nullable=False, index=True)
     predicted_confidence = Column(Float, nullable=False)
-    correct_label = Column(String(50), nullable=True)
+    correct_label = Column(String(50), nullable=True, index=True)
     model_version = Column(String(50), nullable=True)
     moderator_id = Column(String(100), nullable=True)
     notes = Column(Text, nullable=True)
@@ -21,7 +21,19 @@ class Feedback(Base):
     metadata_features = Column(JSON, nullable=True)
     preprocessing = Column(JSON, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+
+
+class FeedbackCounter(Base):
+    """
+    Rollup counters for the dashboard, maintained in the same transaction
+    as every feedback insert and delete.
+    """
+
+    __tablename__ = "feedback_counters"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from datasets import Dataset
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, Trainer
+from transformers import AutoTokenizer, AutoModelForSequenceClassification, DataCollatorWithPadding, Trainer
 from sklearn.metrics import accuracy_score, f1_score
 import datasets
 import torch
@@ -36,12 +36,14 @@ def tokenize(batch):
     return tokenizer(
         batch["content"],
         truncation=True,
-        padding="max_length",
         max_length=MAX_LEN
     )
 
 test_ds = Dataset.from_pandas(df)
 test_ds = test_ds.map(tokenize, batched=True)
+# Sort by token length so each eval batch holds similar lengths and pads to its longest item
+test_ds = test_ds.map(lambda batch: {"length": [len(ids) for ids in batch["input_ids"]]}, batched=True)
+test_ds = test_ds.sort("length")
 test_ds = test_ds.rename_column("label", "labels")
 test_ds = test_ds.cast_column("labels", datasets.Value("int64"))
 
@@ -77,6 +79,7 @@ def evaluate_model(model_path):
     trainer = Trainer(
         model=model,
         tokenizer=tokenizer,
+        data_collator=DataCollatorWithPadding(tokenizer, padding="longest"),
         compute_metrics=compute_metrics
     )
 
@@ -0,0 +1,27 @@
+import os
+
+from hate_speech.config import settings
+
+# Serving config shared by Procfile, Dockerfile and railway.toml.
+# With PRELOAD_MODEL=true the app (and model) is imported once in the
+# master and forked workers share the weights copy-on-write.
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+# Same source as the app (environment + .env), so both agree on preloading.
+preload_app = settings.PRELOAD_MODEL
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def post_fork(server, worker):
+    from db.session import engine
+    from hate_speech.runtime import configure_torch_threads
+
+    # Connections opened in the master (migrations at import) must not be
+    # shared with the children; drop them from this worker's pool without
+    # closing the parent's sockets.
+    engine.dispose(close=False)
+
+    threads = configure_torch_threads(workers)
+    server.log.info("Worker %s using %s torch threads", worker.pid, threads)
@@ -0,0 +1,185 @@
+import hashlib
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import torch
+from transformers import AutoModelForSequenceClassification
+
+ONNX_DIR = "onnx"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model.int8.onnx"
+QUANTIZED_DIR = "quantized"
+QUANTIZED_MODEL_FILE = "model_int8.pt"
+# Written next to each artifact: fingerprint of the checkpoint it was built from
+SOURCE_FINGERPRINT_FILE = "source_fingerprint"
+
+CHECKPOINT_FILES = ("model.safetensors", "pytorch_model.bin", "config.json")
+ARTIFACT_FILES = (
+    f"{ONNX_DIR}/{ONNX_MODEL_FILE}",
+    f"{ONNX_DIR}/{ONNX_INT8_MODEL_FILE}",
+    f"{QUANTIZED_DIR}/{QUANTIZED_MODEL_FILE}",
+)
+
+BACKENDS = ("torch", "torch_int8", "onnx")
+
+
+def fingerprint_files(model_dir: str, names) -> str:
+    """
+    Hash of the size and mtime of each file that exists under `model_dir`.
+    Cheap enough to poll; shutil.copy2/copytree preserve it.
+    """
+    digest = hashlib.sha256()
+    for name in names:
+        path = Path(model_dir) / name
+        if path.exists():
+            stat = path.stat()
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def checkpoint_fingerprint(model_dir: str) -> str:
+    return fingerprint_files(model_dir, CHECKPOINT_FILES)
+
+
+def record_source(artifact_dir: Path, model_dir: str) -> None:
+    (artifact_dir / SOURCE_FINGERPRINT_FILE).write_text(checkpoint_fingerprint(model_dir))
+
+
+def artifact_is_current(artifact_dir: Path, model_dir: str) -> bool:
+    """
+    True when `artifact_dir` was exported from the checkpoint currently in `model_dir`.
+    """
+    marker = artifact_dir / SOURCE_FINGERPRINT_FILE
+    if not marker.exists():
+        return False
+    return marker.read_text().strip() == checkpoint_fingerprint(model_dir)
+
+
+def remove_artifacts(model_dir: str) -> None:
+    """
+    Deletes exported artifacts so no backend can serve them for a newer checkpoint.
+    """
+    for name in (ONNX_DIR, QUANTIZED_DIR):
+        shutil.rmtree(Path(model_dir) / name, ignore_errors=True)
+
+
+def quantize_linear_int8(model: torch.nn.Module) -> torch.nn.Module:
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+class TorchBackend:
+    """
+    Eager PyTorch inference on whatever device the model lives on.
+    """
+
+    name = "torch"
+
+    def __init__(self, model: torch.nn.Module, device: str):
+        self.model = model
+        self.device = device
+        self.model.to(self.device)
+        self.model.eval()
+
+    def logits(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+        return outputs.logits.float().cpu()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """
+    PyTorch with int8 dynamic quantization of the Linear layers (CPU only).
+    """
+
+    name = "torch_int8"
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__(model, "cpu")
+
+    @classmethod
+    def from_pretrained(cls, model_dir: str, config) -> "QuantizedTorchBackend":
+        """
+        Loads the quantized module saved by `hate_speech.export` when it was
+        built from this checkpoint, without materializing the fp32 model;
+        otherwise loads the fp32 checkpoint and quantizes it here.
+        """
+        artifact_dir = Path(model_dir) / QUANTIZED_DIR
+        path = artifact_dir / QUANTIZED_MODEL_FILE
+        if path.exists() and artifact_is_current(artifact_dir, model_dir):
+            # A whole pickled module (written by our own export), not a state_dict.
+            return cls(torch.load(path, map_location="cpu", weights_only=False))
+
+        model = AutoModelForSequenceClassification.from_pretrained(model_dir, config=config)
+        model.eval()
+        return cls(quantize_linear_int8(model))
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime inference over the graph exported by `hate_speech.export`.
+
+    The session is created on first use, not here: ONNX Runtime is not
+    fork-safe, so a session built in a preloading gunicorn master would
+    hand workers a thread pool that did not survive the fork.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, quantized: bool = True):
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError(
+                "INFERENCE_BACKEND=onnx requires the onnxruntime package."
+            ) from exc
+
+        onnx_dir = Path(model_dir) / ONNX_DIR
+        path = onnx_dir / (ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        if quantized and not path.exists():
+            path = onnx_dir / ONNX_MODEL_FILE
+        if not path.exists():
+            raise RuntimeError(
+                f"No ONNX graph found in {onnx_dir}. Run `python -m hate_speech.export --model-dir {model_dir}`."
+            )
+        if not artifact_is_current(onnx_dir, model_dir):
+            raise RuntimeError(
+                f"ONNX graph in {onnx_dir} was not exported from the current checkpoint. "
+                f"Run `python -m hate_speech.export --model-dir {model_dir}`."
+            )
+
+        self.path = path
+        self.session = None
+        self.input_names: Optional[set] = None
+        self._lock = threading.Lock()
+
+    def _get_session(self):
+        if self.session is None:
+            with self._lock:
+                if self.session is None:
+                    import onnxruntime as ort
+
+                    options = ort.SessionOptions()
+                    # Read now, inside the worker, after post_fork has split the cores.
+                    options.intra_op_num_threads = torch.get_num_threads()
+                    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                    session = ort.InferenceSession(
+                        str(self.path), sess_options=options, providers=["CPUExecutionProvider"]
+                    )
+                    self.input_names = {i.name for i in session.get_inputs()}
+                    self.session = session
+        return self.session
+
+    def logits(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        session = self._get_session()
+        feed = {
+            k: v.cpu().numpy().astype("int64")
+            for k, v in inputs.items()
+            if k in self.input_names
+        }
+        outputs = session.run(None, feed)
+        return torch.from_numpy(outputs[0]).float()
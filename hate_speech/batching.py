@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def bucket_for_length(length: int, boundaries: Sequence[int]) -> int:
+    """
+    Smallest bucket boundary that fits `length`; longer inputs keep their own length.
+    """
+    for boundary in boundaries:
+        if length <= boundary:
+            return boundary
+    return length
+
+
+def group_by_bucket(
+    lengths: Sequence[int], boundaries: Sequence[int], max_batch_size: int
+) -> List[List[int]]:
+    """
+    Groups item indices by length bucket, splitting each bucket into
+    chunks of at most `max_batch_size`. Indices keep their input order
+    inside a bucket so results can be scattered back deterministically.
+    """
+    buckets: Dict[int, List[int]] = {}
+    for idx, length in enumerate(lengths):
+        buckets.setdefault(bucket_for_length(length, boundaries), []).append(idx)
+
+    groups = []
+    for bucket in sorted(buckets):
+        indices = buckets[bucket]
+        for start in range(0, len(indices), max(1, max_batch_size)):
+            groups.append(indices[start:start + max_batch_size])
+    return groups
+
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-text requests into one batched call.
+
+    Callers block on `submit`; a background worker drains the queue,
+    waiting at most `max_wait_ms` for up to `max_batch_size` items, and
+    runs them through `batch_fn` in a single forward pass.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[str], bool], List[Dict]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[Tuple[str, bool, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="micro-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def submit(self, text: str, include_embedding: bool = False) -> Dict:
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, include_embedding, future))
+        return future.result()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the worker after it finishes anything already queued, releasing
+        its reference to `batch_fn`.
+        """
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+        if worker is not None and worker.is_alive():
+            self._queue.put(_STOP)
+            worker.join(timeout)
+
+    def _collect(self) -> List[Tuple[str, bool, Future]]:
+        first = self._queue.get()
+        if first is _STOP:
+            return []
+        items = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Serve this batch first; the next _collect sees the stop.
+                self._queue.put(_STOP)
+                break
+            items.append(item)
+        return items
+
+    def _run(self) -> None:
+        while True:
+            items = self._collect()
+            if not items:
+                return
+            # Embedding requests take a different code path, so batch them separately.
+            groups: Dict[bool, List[Tuple[str, bool, Future]]] = {}
+            for item in items:
+                groups.setdefault(item[1], []).append(item)
+
+            for include_embedding, group in groups.items():
+                texts = [text for text, _, _ in group]
+                try:
+                    results = self.batch_fn(texts, include_embedding)
+                except Exception as exc:
+                    for _, _, future in group:
+                        future.set_exception(exc)
+                    continue
+                for (_, _, future), result in zip(group, results):
+                    future.set_result(result)
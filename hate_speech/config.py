@@ -17,6 +17,85 @@ class Settings(BaseSettings):
     MAX_LENGTH: int = 128
     MODEL_DIR: str = "models/transformer/latest"
     SENTENCE_BERT_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # "torch", "torch_int8" (dynamic quantization) or "onnx" (ONNX Runtime)
+    INFERENCE_BACKEND: str = "torch"
+    ONNX_QUANTIZED: bool = True
+    EXPORT_AFTER_TRAINING: bool = True
+    ENABLE_SENTENCE_BERT: bool = True
+    # "inprocess" or "subprocess"; either way the encoder loads on first use
+    SENTENCE_BERT_MODE: str = "inprocess"
+
+    # Request coalescing for single-text predictions
+    ENABLE_MICRO_BATCHING: bool = True
+    BATCH_MAX_SIZE: int = 16
+    BATCH_MAX_WAIT_MS: float = 5.0
+    PREDICT_BATCH_MAX_TEXTS: int = 64
+
+    # Hot reload: warm-up passes over the canary texts before validation, and
+    # how long a reload waits for requests on the old model to finish
+    RELOAD_WARMUP_ROUNDS: int = 2
+    RELOAD_DRAIN_TIMEOUT_SECONDS: float = 30.0
+    # Each worker polls MODEL_DIR this often and reloads when its weights
+    # change, so a retrain reaches every worker (0 disables)
+    MODEL_WATCH_INTERVAL_SECONDS: float = 30.0
+
+    # Load the model at import time (gunicorn --preload shares it copy-on-write)
+    PRELOAD_MODEL: bool = False
+    # Per-worker torch threads; defaults to cores // workers
+    TORCH_NUM_THREADS: int | None = None
+
+    # Bounded executor for the async predict routes. With micro-batching on,
+    # workers mostly wait on the batcher, so keep this near BATCH_MAX_SIZE.
+    PREDICT_MAX_WORKERS: int = 16
+    PREDICT_MAX_QUEUE: int = 32
+    PREDICT_RETRY_AFTER_SECONDS: int = 1
+
+    # Per-request timing breakdown (PredictRequest.debug or X-Debug-Timing header).
+    # Off by default: debug requests skip the micro-batcher and expose internals.
+    DEBUG_TIMING_ENABLED: bool = False
+    # Token for admin-only endpoints (X-Admin-Token); empty disables them
+    ADMIN_TOKEN: str = ""
+    PROFILE_DIR: str = "profiles"
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_MAX_REQUESTS: int = 100
+
+    # Streaming bulk classification
+    BULK_CHUNK_SIZE: int = 64
+    # Longest JSONL line / CSV record accepted by /predict/stream
+    STREAM_MAX_RECORD_CHARS: int = 64000
+    BULK_MAX_TEXT_CHARS: int = 5000
+
+    # Bulk feedback ingestion
+    FEEDBACK_BULK_MAX_ITEMS: int = 1000
+    FEEDBACK_BULK_CHUNK_SIZE: int = 500
+    FEEDBACK_WRITE_BEHIND: bool = False
+    FEEDBACK_WRITE_BEHIND_MAX_BATCH: int = 200
+    FEEDBACK_WRITE_BEHIND_MAX_DELAY_MS: float = 250.0
+    FEEDBACK_WRITE_BEHIND_QUEUE_SIZE: int = 10000
+    FEEDBACK_WRITE_BEHIND_MAX_RETRIES: int = 3
+    FEEDBACK_WRITE_BEHIND_RETRY_BACKOFF_MS: float = 200.0
+
+    # Token-length buckets used for dynamic padding (comma-separated, ascending)
+    LENGTH_BUCKETS: str = "16,32,64,128"
+
+    # spaCy nlp.pipe settings for batch preprocessing
+    SPACY_BATCH_SIZE: int = 256
+    SPACY_N_PROCESS: int = 1
+
+    # Language identification stage
+    LANGUAGE_DETECTION_ENABLED: bool = True
+    LANGUAGE_DETECTION_MIN_CHARS: int = 20
+    LANGUAGE_DETECTION_CACHE_SIZE: int = 4096
+    LANGUAGE_DETECTION_SEED: int = 0
+
+    # Sentiment backend for metadata features: "textblob" or "none"
+    FEATURE_SENTIMENT: str = "textblob"
+
+    # Prediction result cache (in-process LRU + Redis)
+    PREDICTION_CACHE_ENABLED: bool = True
+    PREDICTION_CACHE_MAX_ENTRIES: int = 10000
+    PREDICTION_CACHE_TTL_SECONDS: int = 600
+    PREDICTION_CACHE_REDIS_TTL_SECONDS: int = 86400
 
     TRAIN_BATCH_SIZE: int = 16
     EVAL_BATCH_SIZE: int = 32
@@ -32,6 +111,10 @@ class Settings(BaseSettings):
     TRAIN_FILE: str = "data/processed/train.csv"
     VAL_FILE: str = "data/processed/val.csv"
     TEST_FILE: str = "data/processed/test.csv"
+    DATASET_CACHE_DIR: str = "data/cache"
+    DATASET_CACHE_ENABLED: bool = True
+    PREPROCESS_NUM_WORKERS: int = 1
+    PREPROCESS_CHUNK_SIZE: int = 512
 
     DATABASE_URL: str = "sqlite:///./hate_speech.db"
     ALLOWED_ORIGINS: str = "http://localhost:3000"
@@ -44,12 +127,26 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str | None = None
     REDIS_SSL: bool = False
+    # Per worker. Every predict executor thread and request threadpool thread
+    # (anyio default 40) may hold one at once; size it at least
+    # PREDICT_MAX_WORKERS + that, or lookups past the limit are skipped.
+    REDIS_MAX_CONNECTIONS: int = 20
+    REDIS_POOL_TIMEOUT: float = 0.5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 0.5
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 3
+    REDIS_BREAKER_COOLDOWN_SECONDS: float = 30.0
 
     @property
     def allowed_origins_list(self) -> list[str]:
         origins = [o.strip() for o in self.ALLOWED_ORIGINS.split(",") if o.strip()]
         return origins or ["http://localhost:3000"]
 
+    @property
+    def length_buckets_list(self) -> list[int]:
+        buckets = sorted({int(b) for b in self.LENGTH_BUCKETS.split(",") if b.strip()})
+        return buckets or [self.MAX_LENGTH]
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable
+
+from datasets import Dataset, load_from_disk
+
+from .preprocessing import PreprocessingConfig
+
+# Bump when the cached columns or their meaning change.
+CACHE_FORMAT_VERSION = 1
+
+
+def file_fingerprint(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    return json.dumps(
+        {
+            "class": type(tokenizer).__name__,
+            "name": tokenizer.name_or_path,
+            "vocab_size": len(tokenizer),
+        },
+        sort_keys=True,
+    )
+
+
+def cache_key(
+    source_path: str,
+    preprocessing_config: PreprocessingConfig,
+    tokenizer,
+    max_length: int,
+) -> str:
+    payload = json.dumps(
+        {
+            "format": CACHE_FORMAT_VERSION,
+            "source": file_fingerprint(source_path),
+            "preprocessing": preprocessing_config.fingerprint(),
+            "tokenizer": tokenizer_fingerprint(tokenizer),
+            "max_length": max_length,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def load_or_build(cache_dir: str, key: str, build_fn: Callable[[], Dataset]) -> Dataset:
+    """
+    Returns the cached dataset for `key` (memory-mapped Arrow) or builds,
+    saves and returns it. Writes go to a temp dir first so an interrupted
+    run never leaves a half-written cache entry behind.
+    """
+    path = Path(cache_dir) / key
+    if path.exists():
+        print(f"Loading cached dataset from {path}")
+        return load_from_disk(str(path))
+
+    dataset = build_fn()
+    tmp_path = Path(cache_dir) / f".{key}.tmp"
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    dataset.save_to_disk(str(tmp_path))
+    os.replace(tmp_path, path)
+    print(f"Cached dataset at {path}")
+    return load_from_disk(str(path))
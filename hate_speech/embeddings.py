@@ -0,0 +1,71 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+_worker_model = None
+
+
+def _init_worker(model_name: str) -> None:
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode_in_worker(texts: List[str]) -> List[List[float]]:
+    return _worker_model.encode(texts, normalize_embeddings=True).tolist()
+
+
+class SentenceEncoder:
+    """
+    Sentence-BERT encoder that is only loaded on first use.
+
+    mode="inprocess" loads the model inside the serving process;
+    mode="subprocess" keeps it in a dedicated worker process so the
+    weights never count against the API worker's memory.
+    """
+
+    def __init__(self, model_name: str, mode: str = "inprocess"):
+        if mode not in ("inprocess", "subprocess"):
+            raise ValueError(f"Unknown sentence encoder mode: {mode}")
+        self.model_name = model_name
+        self.mode = mode
+        self._model = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None or self._pool is not None
+
+    def _ensure_loaded(self) -> None:
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            if self.mode == "subprocess":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_name,),
+                )
+            else:
+                from sentence_transformers import SentenceTransformer
+
+                self._model = SentenceTransformer(self.model_name)
+
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        self._ensure_loaded()
+        if self._pool is not None:
+            return self._pool.submit(_encode_in_worker, texts).result()
+        return self._model.encode(texts, normalize_embeddings=True).tolist()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            self._model = None
@@ -0,0 +1,102 @@
+import argparse
+from pathlib import Path
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from .backends import (
+    ONNX_DIR,
+    ONNX_INT8_MODEL_FILE,
+    ONNX_MODEL_FILE,
+    QUANTIZED_DIR,
+    QUANTIZED_MODEL_FILE,
+    quantize_linear_int8,
+    record_source,
+    remove_artifacts,
+)
+from .config import settings
+
+
+def export_int8(model_dir: str) -> Path:
+    """
+    Saves the int8 dynamically quantized module next to the checkpoint,
+    whole, so serving can load it without building the fp32 model first.
+    """
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+    quantized = quantize_linear_int8(model)
+
+    out_dir = Path(model_dir) / QUANTIZED_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / QUANTIZED_MODEL_FILE
+    torch.save(quantized, out_path)
+    record_source(out_dir, model_dir)
+    return out_path
+
+
+def export_onnx(model_dir: str) -> Path:
+    """
+    Exports the classifier to ONNX with dynamic batch/sequence axes and,
+    when onnxruntime is installed, an int8 dynamically quantized copy.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    out_dir = Path(model_dir) / ONNX_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / ONNX_MODEL_FILE
+
+    dummy = tokenizer(
+        ["export sample text"], truncation=True, max_length=settings.MAX_LENGTH, return_tensors="pt"
+    )
+    input_names = ["input_ids", "attention_mask"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            str(out_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError:
+        record_source(out_dir, model_dir)
+        return out_path
+
+    quantize_dynamic(
+        str(out_path), str(out_dir / ONNX_INT8_MODEL_FILE), weight_type=QuantType.QInt8
+    )
+    record_source(out_dir, model_dir)
+    return out_path
+
+
+def export_all(model_dir: str) -> None:
+    """
+    Post-training step: writes CPU-optimized artifacts for every backend.
+    Failures are reported but never fail the training run. Artifacts from
+    an earlier checkpoint are removed first, so a failed export leaves
+    nothing stale behind.
+    """
+    remove_artifacts(model_dir)
+    for name, fn in (("int8", export_int8), ("onnx", export_onnx)):
+        try:
+            path = fn(model_dir)
+            print(f"Exported {name} artifact to {path}")
+        except Exception as exc:
+            print(f"Skipping {name} export for {model_dir}: {exc}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", type=str, default=settings.MODEL_DIR)
+    args = parser.parse_args()
+
+    export_all(args.model_dir)
@@ -1,7 +1,11 @@
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
-from textblob import TextBlob
+import numpy as np
+
+from .metrics import stage_timer
+
+SentimentFn = Callable[[str], Tuple[float, float]]
 
 
 @dataclass
@@ -17,36 +21,98 @@ class MetadataFeatures:
     hashtag_count: int
 
 
+FEATURE_NAMES = [f.name for f in fields(MetadataFeatures)]
+FLOAT_FEATURES = {"polarity", "subjectivity", "uppercase_ratio"}
+
+
+def textblob_sentiment(text: str) -> Tuple[float, float]:
+    from textblob import TextBlob
+
+    sentiment = TextBlob(text).sentiment
+    return float(sentiment.polarity), float(sentiment.subjectivity)
+
+
+def no_sentiment(text: str) -> Tuple[float, float]:
+    return 0.0, 0.0
+
+
+SENTIMENT_BACKENDS: Dict[str, SentimentFn] = {
+    "textblob": textblob_sentiment,
+    "none": no_sentiment,
+}
+
+
 class FeatureExtractor:
-    def __init__(self):
-        pass
+    """
+    Metadata features for explainability.
+
+    `sentiment` picks a named sentiment backend ("textblob" or "none");
+    `sentiment_fn` replaces it with any callable returning
+    (polarity, subjectivity).
+    """
+
+    def __init__(
+        self,
+        sentiment: str = "textblob",
+        sentiment_fn: Optional[SentimentFn] = None,
+    ):
+        if sentiment_fn is None:
+            if sentiment not in SENTIMENT_BACKENDS:
+                raise ValueError(f"Unknown sentiment backend: {sentiment}")
+            sentiment_fn = SENTIMENT_BACKENDS[sentiment]
+        self.sentiment_fn = sentiment_fn
+
+    def extract_batch(self, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Computes all features for many texts at once; returns one array per feature.
+        """
+        n = len(texts)
+        columns = {
+            name: np.zeros(n, dtype=np.float64 if name in FLOAT_FEATURES else np.int64)
+            for name in FEATURE_NAMES
+        }
+
+        with stage_timer("sentiment"):
+            for i, text in enumerate(texts):
+                polarity, subjectivity = self.sentiment_fn(text)
+                columns["polarity"][i] = polarity
+                columns["subjectivity"][i] = subjectivity
+
+        with stage_timer("metadata_counts"):
+            for i, text in enumerate(texts):
+                for name, value in self._count_features(text).items():
+                    columns[name][i] = value
+
+        return columns
+
+    @staticmethod
+    def _count_features(text: str) -> Dict[str, float]:
+        # str.count / map(str.isX) run in C; no per-character Python loop.
+        alpha_chars = sum(map(str.isalpha, text))
+        return {
+            "length_chars": len(text),
+            "length_words": len(text.split()),
+            "exclamation_count": text.count("!"),
+            "question_count": text.count("?"),
+            "uppercase_ratio": sum(map(str.isupper, text)) / alpha_chars if alpha_chars else 0.0,
+            "mention_count": text.count("@"),
+            "hashtag_count": text.count("#"),
+        }
+
+    @staticmethod
+    def to_rows(columns: Dict[str, np.ndarray]) -> List[Dict[str, float]]:
+        lists = {name: columns[name].tolist() for name in FEATURE_NAMES}
+        n = len(lists[FEATURE_NAMES[0]])
+        return [{name: lists[name][i] for name in FEATURE_NAMES} for i in range(n)]
 
     def extract(self, text: str) -> Dict[str, float]:
-        blob = TextBlob(text)
-        polarity = float(blob.sentiment.polarity)
-        subjectivity = float(blob.sentiment.subjectivity)
-
-        length_chars = len(text)
-        words = text.split()
-        length_words = len(words)
-
-        exclamation_count = text.count("!")
-        question_count = text.count("?")
-        uppercase_chars = sum(1 for c in text if c.isupper())
-        alpha_chars = sum(1 for c in text if c.isalpha())
-        uppercase_ratio = (uppercase_chars / alpha_chars) if alpha_chars > 0 else 0.0
-
-        mention_count = text.count("@")
-        hashtag_count = text.count("#")
-
-        return MetadataFeatures(
-            polarity=polarity,
-            subjectivity=subjectivity,
-            length_chars=length_chars,
-            length_words=length_words,
-            exclamation_count=exclamation_count,
-            question_count=question_count,
-            uppercase_ratio=uppercase_ratio,
-            mention_count=mention_count,
-            hashtag_count=hashtag_count,
-        ).__dict__
+        """
+        Single-text path (every /predict): builds the dict directly, with no
+        per-feature arrays.
+        """
+        with stage_timer("sentiment"):
+            polarity, subjectivity = self.sentiment_fn(text)
+        with stage_timer("metadata_counts"):
+            counts = self._count_features(text)
+        features = {"polarity": float(polarity), "subjectivity": float(subjectivity), **counts}
+        return {name: features[name] for name in FEATURE_NAMES}
@@ -1,38 +1,379 @@
-from typing import Dict, Optional
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set
+from .backends import ARTIFACT_FILES, CHECKPOINT_FILES, fingerprint_files
+from .batching import MicroBatcher
 from .config import settings
-from .model import HateSpeechModel
+from .model import LABEL_MAP, HateSpeechModel
+from .preprocessing import PreprocessingConfig
+from .runtime import release_memory
+
+
+# Short to long inputs, so warm-up touches every length bucket.
+CANARY_TEXTS = [
+    "ok",
+    "thanks for sharing this",
+    "@user you people are the worst, go back to where you came from",
+    "I really enjoyed the game last night, the second half was incredible #GameDay 😂",
+    " ".join(["this is a much longer message that keeps going"] * 12),
+]
+
+
+def resolve_model_version(model_dir: str) -> str:
+    """
+    Identifies a model by its directory name plus a fingerprint of its weight
+    files and exported backend artifacts, so `latest` gets a new version every
+    time any of them is replaced.
+    """
+    path = Path(model_dir)
+    if not path.is_dir():
+        return model_dir
+
+    fingerprint = fingerprint_files(model_dir, CHECKPOINT_FILES + ARTIFACT_FILES)
+    return f"{path.resolve().name}-{fingerprint[:10]}"
+
+
+def validate_canaries(model: HateSpeechModel) -> None:
+    """
+    Sanity-checks a freshly loaded model before it takes traffic: valid
+    labels, finite probabilities that sum to 1, and single-text and batched
+    predictions that agree (catches padding/tokenizer mismatches).
+    """
+    batched = model.predict_batch(CANARY_TEXTS)
+    for result in batched:
+        probs = list(result["probabilities"].values())
+        if result["label"] not in LABEL_MAP.values():
+            raise RuntimeError(f"Canary produced unknown label {result['label']!r}")
+        if not all(math.isfinite(p) for p in probs) or abs(sum(probs) - 1.0) > 1e-3:
+            raise RuntimeError(f"Canary produced invalid probabilities {probs}")
+
+    single = model.predict(CANARY_TEXTS[-1])
+    if single["label"] != batched[-1]["label"] or abs(single["confidence"] - batched[-1]["confidence"]) > 1e-3:
+        raise RuntimeError("Single and batched predictions disagree on canary input")
+
+
+class ModelHandle:
+    """
+    A loaded model, its micro-batcher and the requests currently using it.
+
+    The service swaps handles atomically. A retired handle stays usable
+    until its last in-flight request releases it; the reloading thread then
+    closes the model and returns its memory, off the request path.
+    """
+
+    def __init__(self, model: HateSpeechModel, model_dir: str, version: str):
+        self.model = model
+        self.model_dir = model_dir
+        self.version = version
+        self.batcher: Optional[MicroBatcher] = None
+        if settings.ENABLE_MICRO_BATCHING:
+            self.batcher = MicroBatcher(
+                self._predict_batch,
+                max_batch_size=settings.BATCH_MAX_SIZE,
+                max_wait_ms=settings.BATCH_MAX_WAIT_MS,
+            )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._retired = False
+        self._drained = threading.Event()
+
+    def _predict_batch(self, texts: List[str], include_embedding: bool = False) -> List[Dict]:
+        return self.model.predict_batch(texts, include_embedding=include_embedding)
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            drained = self._retired and self._in_flight == 0
+        if drained:
+            self._drained.set()
+
+    def retire(self) -> None:
+        with self._lock:
+            self._retired = True
+            drained = self._in_flight == 0
+        if drained:
+            self._drained.set()
+
+    def close_when_drained(self, timeout: float) -> bool:
+        """
+        Waits up to `timeout` for in-flight requests, then closes. On timeout
+        a daemon thread finishes the job once the stragglers are done.
+        """
+        if self._drained.wait(timeout):
+            self._close()
+            return True
+
+        def close_later() -> None:
+            self._drained.wait()
+            self._close()
+
+        threading.Thread(target=close_later, name="model-drain", daemon=True).start()
+        return False
+
+    def _close(self) -> None:
+        if self.batcher is not None:
+            self.batcher.close()
+            self.batcher = None
+        self.model.close()
+        self.model = None
+        release_memory()
+
+    def predict(self, text: str, include_embedding: bool, direct: bool) -> Dict:
+        if self.batcher is not None and not direct:
+            result = self.batcher.submit(text, include_embedding=include_embedding)
+        else:
+            result = self.model.predict(text, include_embedding=include_embedding)
+        result["model_version"] = self.version
+        return result
+
+    def predict_batch(self, texts: List[str], include_embedding: bool) -> List[Dict]:
+        results = self.model.predict_batch(texts, include_embedding=include_embedding)
+        for result in results:
+            result["model_version"] = self.version
+        return results
 
 
 class InferenceService:
     def __init__(self, model_dir: str = None):
-        self._model: Optional[HateSpeechModel] = None
         self._model_dir = model_dir or settings.MODEL_DIR
+        self._handle: Optional[ModelHandle] = None
         self._last_error: Optional[str] = None
+        # Guards reads and swaps of _handle; held only for pointer updates.
+        self._swap_lock = threading.Lock()
+        # Serializes model loads (first lazy load and reloads).
+        self._load_lock = threading.Lock()
+        self._reload_status: Dict = {"state": "idle"}
+        # The served model always uses the default preprocessing config.
+        self._preprocessing_fingerprint = PreprocessingConfig().fingerprint()
+        self._reload_listeners: List[Callable[[], None]] = []
+        self._watch_stop: Optional[threading.Event] = None
+        # Versions that failed to load or validate; the watcher does not retry them.
+        self._failed_versions: Set[str] = set()
 
     def _ensure_loaded(self) -> None:
-        if self._model is not None:
+        if self._handle is not None:
             return
-        try:
-            self._model = HateSpeechModel(self._model_dir)
+        with self._load_lock:
+            if self._handle is not None:
+                return
+            try:
+                model = HateSpeechModel(self._model_dir)
+                handle = ModelHandle(model, self._model_dir, resolve_model_version(self._model_dir))
+            except Exception as exc:
+                self._last_error = str(exc)
+                raise RuntimeError(
+                    "Model is not available. Set MODEL_DIR to a valid local model path or a valid Hugging Face model id."
+                ) from exc
+            with self._swap_lock:
+                self._handle = handle
             self._last_error = None
-        except Exception as exc:
-            self._last_error = str(exc)
-            raise RuntimeError(
-                "Model is not available. Set MODEL_DIR to a valid local model path or a valid Hugging Face model id."
-            ) from exc
 
-    def predict(self, text: str, include_embedding: bool = False) -> Dict:
+    @contextmanager
+    def _use_model(self) -> Iterator[ModelHandle]:
+        """
+        Pins the current model for the duration of a request, so a concurrent
+        reload cannot free it mid-prediction.
+        """
         self._ensure_loaded()
-        return self._model.predict(text, include_embedding=include_embedding)
+        with self._swap_lock:
+            handle = self._handle
+            handle.acquire()
+        try:
+            yield handle
+        finally:
+            handle.release()
+
+    def preload(self) -> None:
+        """
+        Loads the model before workers fork so they share its weights
+        copy-on-write. No forward pass runs here: intra-op thread pools
+        (torch, and the ONNX Runtime session, which is created lazily)
+        must only start inside the workers.
+        """
+        self._ensure_loaded()
+
+    @property
+    def model_version(self) -> Optional[str]:
+        handle = self._handle
+        return handle.version if handle is not None else None
+
+    def cache_namespace(self, version: Optional[str] = None) -> str:
+        """
+        Model version + preprocessing config; changes whenever cached results would.
+        Pass `version` to get the namespace of the model that produced a result.
+        """
+        if version is None:
+            self._ensure_loaded()
+            version = self._handle.version
+        return f"{version}:{self._preprocessing_fingerprint}"
+
+    def predict(
+        self, text: str, include_embedding: bool = False, direct: bool = False
+    ) -> Dict:
+        """
+        `direct=True` skips the micro-batcher so the work runs on the calling
+        thread (used for per-request timing and profiling).
+        """
+        with self._use_model() as handle:
+            return handle.predict(text, include_embedding, direct)
+
+    def predict_batch(
+        self, texts: List[str], include_embedding: bool = False
+    ) -> List[Dict]:
+        with self._use_model() as handle:
+            return handle.predict_batch(texts, include_embedding)
+
+    def reload(self, new_model_dir: str, background: bool = False) -> None:
+        """
+        Loads, warms up and validates `new_model_dir` while the current model
+        keeps serving, then swaps atomically. Requests already running finish
+        on the old model, which is closed once they drain.
+
+        With `background=True` this returns immediately; progress is reported
+        under `reload` in readiness(). A model that fails validation is
+        discarded and the current one stays active.
+        """
+        if background:
+            threading.Thread(
+                target=self._reload_quietly, args=(new_model_dir,), name="model-reload", daemon=True
+            ).start()
+            return
+        self._reload(new_model_dir)
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Registers a callback run after every successful swap in this process.
+        """
+        self._reload_listeners.append(listener)
+
+    def watch_model_dir(self, interval_seconds: float) -> None:
+        """
+        Polls the served model directory and hot-reloads when its weights
+        change, so every worker process picks up a retrained model, not just
+        the one that ran the retraining. A new version is only loaded once it
+        has been seen unchanged on two consecutive polls, so a checkpoint
+        that is still being written is not picked up half-way.
+
+        Must be started in each worker (after fork): threads do not survive fork.
+        """
+        if interval_seconds <= 0 or self._watch_stop is not None:
+            return
+        self._watch_stop = threading.Event()
+        threading.Thread(
+            target=self._watch,
+            args=(interval_seconds, self._watch_stop),
+            name="model-watch",
+            daemon=True,
+        ).start()
+
+    def stop_watching(self) -> None:
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    def _watch(self, interval_seconds: float, stop: threading.Event) -> None:
+        pending = None
+        while not stop.wait(interval_seconds):
+            handle = self._handle
+            if handle is None:
+                # Nothing loaded yet; the first load reads the current files.
+                continue
+            current = resolve_model_version(handle.model_dir)
+            if current == handle.version or current in self._failed_versions:
+                pending = None
+                continue
+            if current != pending:
+                pending = current
+                continue
+            pending = None
+            try:
+                self._reload(handle.model_dir, only_if_changed=True)
+            except Exception:
+                # Already recorded in the reload status.
+                self._failed_versions.add(current)
+
+    def _reload_quietly(self, new_model_dir: str) -> None:
+        try:
+            self._reload(new_model_dir)
+        except Exception:
+            # Already recorded in the reload status.
+            pass
+
+    def _set_status(self, **status) -> None:
+        self._reload_status = {**self._reload_status, **status}
+
+    def _reload(self, new_model_dir: str, only_if_changed: bool = False) -> None:
+        with self._load_lock:
+            handle = self._handle
+            if (
+                only_if_changed
+                and handle is not None
+                and handle.model_dir == new_model_dir
+                and resolve_model_version(new_model_dir) == handle.version
+            ):
+                # Another caller in this process already loaded these weights.
+                return
+            started = time.monotonic()
+            self._reload_status = {"state": "loading", "model_dir": new_model_dir}
+            model = None
+            try:
+                model = HateSpeechModel(new_model_dir)
+                version = resolve_model_version(new_model_dir)
+
+                self._set_status(state="warming_up", model_version=version)
+                for _ in range(settings.RELOAD_WARMUP_ROUNDS):
+                    model.predict_batch(CANARY_TEXTS)
+
+                self._set_status(state="validating")
+                validate_canaries(model)
+            except Exception as exc:
+                if model is not None:
+                    model.close()
+                    release_memory()
+                self._set_status(state="failed", error=str(exc))
+                raise RuntimeError(f"Reload of {new_model_dir} failed: {exc}") from exc
+
+            new_handle = ModelHandle(model, new_model_dir, version)
+            with self._swap_lock:
+                old_handle, self._handle = self._handle, new_handle
+                self._model_dir = new_model_dir
+            self._last_error = None
+            for listener in self._reload_listeners:
+                listener()
+            self._set_status(state="draining", swapped_after_seconds=round(time.monotonic() - started, 3))
 
-    def reload(self, new_model_dir: str):
-        # Atomic model swap
-        self._model_dir = new_model_dir
-        self._model = HateSpeechModel(new_model_dir)
-        self._last_error = None
+            drained = True
+            if old_handle is not None:
+                old_handle.retire()
+                drained = old_handle.close_when_drained(settings.RELOAD_DRAIN_TIMEOUT_SECONDS)
+            self._set_status(
+                state="active" if drained else "active_draining",
+                previous_version=old_handle.version if old_handle else None,
+                total_seconds=round(time.monotonic() - started, 3),
+            )
 
     def readiness(self) -> Dict[str, Optional[str]]:
-        if self._model is not None:
-            return {"ready": True, "error": None, "model_dir": self._model_dir}
+        handle = self._handle
+        if handle is not None:
+            return {
+                "ready": True,
+                "error": None,
+                "model_dir": handle.model_dir,
+                "model_version": handle.version,
+                "reload": self._reload_status,
+            }
 
-        return {"ready": False, "error": self._last_error, "model_dir": self._model_dir}
+        return {
+            "ready": False,
+            "error": self._last_error,
+            "model_dir": self._model_dir,
+            "model_version": None,
+            "reload": self._reload_status,
+        }
@@ -0,0 +1,73 @@
+import time
+from functools import lru_cache
+from typing import Dict, List
+
+import langdetect
+from langdetect import DetectorFactory
+
+
+class LanguageIdentifier:
+    """
+    Deterministic, memoized language identification.
+
+    Texts shorter than `min_chars` skip langdetect (which is slow and
+    unreliable on a handful of words) and use a cheap script heuristic.
+    With `enabled=False` every text is assumed to be `default_language`.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        min_chars: int = 20,
+        cache_size: int = 4096,
+        seed: int = 0,
+        default_language: str = "en",
+    ):
+        self.enabled = enabled
+        self.min_chars = min_chars
+        self.default_language = default_language
+        # langdetect samples n-grams randomly; a fixed seed makes results repeatable.
+        DetectorFactory.seed = seed
+        self._detect_cached = lru_cache(maxsize=cache_size)(self._detect_uncached)
+        self.calls = 0
+        self.detector_calls = 0
+        self.total_seconds = 0.0
+
+    def _heuristic(self, text: str) -> str:
+        letters = [c for c in text if c.isalpha()]
+        if not letters:
+            return "unknown"
+        ascii_letters = sum(1 for c in letters if c.isascii())
+        if ascii_letters / len(letters) >= 0.9:
+            return self.default_language
+        return "unknown"
+
+    def _detect_uncached(self, text: str) -> str:
+        if len(text.strip()) < self.min_chars:
+            return self._heuristic(text)
+        self.detector_calls += 1
+        try:
+            return langdetect.detect(text)
+        except langdetect.lang_detect_exception.LangDetectException:
+            return "unknown"
+
+    def detect(self, text: str) -> str:
+        if not self.enabled:
+            return self.default_language
+        start = time.perf_counter()
+        lang = self._detect_cached(text)
+        self.total_seconds += time.perf_counter() - start
+        self.calls += 1
+        return lang
+
+    def detect_batch(self, texts: List[str]) -> List[str]:
+        return [self.detect(t) for t in texts]
+
+    def stats(self) -> Dict[str, float]:
+        info = self._detect_cached.cache_info()
+        return {
+            "calls": self.calls,
+            "detector_calls": self.detector_calls,
+            "cache_hits": info.hits,
+            "mean_call_ms": (self.total_seconds / self.calls * 1000) if self.calls else 0.0,
+        }
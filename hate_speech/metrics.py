@@ -0,0 +1,228 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class _Sharded:
+    """
+    Per-thread accumulators: each thread writes only to its own shard, so
+    recording takes no lock. Shards are summed when metrics are scraped.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshot(self) -> List[Dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict() copies are atomic enough under the GIL for a scrape.
+        return [dict(s) for s in shards]
+
+
+class Counter(_Sharded):
+    def __init__(self, name: str, documentation: str):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        shard = self._shard()
+        key = _label_key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        totals: Dict[LabelKey, float] = {}
+        for shard in self._snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key in sorted(totals):
+            lines.append(f"{self.name}{_format_labels(key)} {totals[key]}")
+        return lines
+
+
+class Histogram(_Sharded):
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        shard = self._shard()
+        key = _label_key(labels)
+        series = shard.get(key)
+        if series is None:
+            # [bucket counts..., +Inf count, sum]
+            series = [0] * (len(self.buckets) + 1) + [0.0]
+            shard[key] = series
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        totals: Dict[LabelKey, List[float]] = {}
+        for shard in self._snapshot():
+            for key, series in shard.items():
+                acc = totals.setdefault(key, [0] * len(series))
+                for i, v in enumerate(list(series)):
+                    acc[i] += v
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key in sorted(totals):
+            series = totals[key]
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', str(bound))])} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class GaugeCallback:
+    """
+    Gauge whose samples are produced by a callback at scrape time.
+    """
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        fn: Callable[[], List[Tuple[Dict[str, str], float]]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        try:
+            samples = self.fn()
+        except Exception:
+            samples = []
+        for labels, value in samples:
+            if value is None:
+                continue
+            lines.append(f"{self.name}{_format_labels(_label_key(labels))} {float(value)}")
+        return lines
+
+
+class CounterCallback(GaugeCallback):
+    """
+    Counter read at scrape time from a monotonic total kept elsewhere
+    (e.g. a component's stats()). Names should end in `_total`.
+    """
+
+    metric_type = "counter"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    "hate_speech_stage_seconds",
+    "Latency of each inference pipeline stage.",
+))
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    "hate_speech_http_request_seconds",
+    "HTTP request latency by route.",
+))
+HTTP_REQUESTS_TOTAL = registry.register(Counter(
+    "hate_speech_http_requests_total",
+    "HTTP requests by route, method and status.",
+))
+HTTP_ERRORS_TOTAL = registry.register(Counter(
+    "hate_speech_http_errors_total",
+    "HTTP requests that failed with a 5xx status or an unhandled exception.",
+))
+
+
+_stage_trace: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_trace", default=None)
+
+
+@contextmanager
+def trace_stages() -> Iterator[Dict[str, float]]:
+    """
+    Collects seconds spent per stage by stage_timer calls made in this context.
+    Work handed to another thread (e.g. the micro-batcher) is not captured.
+    """
+    trace: Dict[str, float] = {}
+    token = _stage_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _stage_trace.reset(token)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        trace = _stage_trace.get()
+        if trace is not None:
+            trace[stage] = trace.get(stage, 0.0) + elapsed
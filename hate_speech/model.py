@@ -1,14 +1,18 @@
 from typing import Dict, List, Optional
 
+import numpy as np
 import torch
-from sentence_transformers import SentenceTransformer
 from transformers import (
     AutoConfig,
     AutoModelForSequenceClassification,
     AutoTokenizer,
 )
 
+from .backends import OnnxBackend, QuantizedTorchBackend, TorchBackend
+from .batching import group_by_bucket
 from .config import settings
+from .embeddings import SentenceEncoder
+from .metrics import stage_timer
 from .preprocessing import TextPreprocessor, PreprocessingConfig
 from .features import FeatureExtractor
 
@@ -34,40 +38,115 @@ class HateSpeechModel:
         self,
         model_path: Optional[str] = None,
         device: Optional[str] = None,
+        backend: Optional[str] = None,
     ):
         self.model_name = model_path or settings.BASE_MODEL_NAME
         self.config = AutoConfig.from_pretrained(
             self.model_name, num_labels=settings.NUM_LABELS
         )
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForSequenceClassification.from_pretrained(
-            self.model_name, config=self.config
-        )
 
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
-        self.model.to(self.device)
-        self.model.eval()
+        self.backend = self._load_backend(backend or settings.INFERENCE_BACKEND)
 
-        # Sentence-BERT for contextual embeddings
-        self.sentence_bert = SentenceTransformer(settings.SENTENCE_BERT_MODEL_NAME)
+        # Sentence-BERT for contextual embeddings, loaded on first use
+        self.sentence_bert: Optional[SentenceEncoder] = None
+        if settings.ENABLE_SENTENCE_BERT:
+            self.sentence_bert = SentenceEncoder(
+                settings.SENTENCE_BERT_MODEL_NAME, mode=settings.SENTENCE_BERT_MODE
+            )
 
         # Preprocessing & features
         self.preprocessor = TextPreprocessor(PreprocessingConfig())
-        self.feature_extractor = FeatureExtractor()
+        self.feature_extractor = FeatureExtractor(sentiment=settings.FEATURE_SENTIMENT)
+
+    def _load_backend(self, name: str):
+        if name == "onnx":
+            self.model = None
+            return OnnxBackend(self.model_name, quantized=settings.ONNX_QUANTIZED)
+
+        if name == "torch_int8":
+            self.device = "cpu"
+            backend = QuantizedTorchBackend.from_pretrained(self.model_name, self.config)
+        elif name == "torch":
+            model = AutoModelForSequenceClassification.from_pretrained(
+                self.model_name, config=self.config
+            )
+            backend = TorchBackend(model, self.device)
+        else:
+            raise ValueError(f"Unknown INFERENCE_BACKEND: {name}")
+        self.model = backend.model
+        return backend
 
     def _predict_logits(self, text: str) -> torch.Tensor:
-        inputs = self.tokenizer(
-            text,
-            truncation=True,
-            padding="max_length",
-            max_length=settings.MAX_LENGTH,
-            return_tensors="pt",
-        )
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-        return logits.squeeze(0)
+        return self._predict_logits_batch([text]).squeeze(0)
+
+    def _predict_logits_batch(
+        self, texts: List[str], max_batch_size: Optional[int] = None
+    ) -> torch.Tensor:
+        # Each stage is observed once per call, however many buckets it splits into.
+        with stage_timer("tokenization"):
+            encoded = self.tokenizer(
+                texts,
+                truncation=True,
+                max_length=settings.MAX_LENGTH,
+            )
+            lengths = [len(ids) for ids in encoded["input_ids"]]
+            groups = group_by_bucket(
+                lengths,
+                settings.length_buckets_list,
+                max_batch_size or settings.BATCH_MAX_SIZE,
+            )
+            # Pad each bucket only to its own longest item.
+            padded = [
+                (
+                    indices,
+                    self.tokenizer.pad(
+                        {k: [encoded[k][i] for i in indices] for k in encoded.keys()},
+                        padding="longest",
+                        return_tensors="pt",
+                    ),
+                )
+                for indices in groups
+            ]
+
+        # Scatter bucket logits back in input order.
+        logits = torch.empty(len(texts), self.config.num_labels)
+        with stage_timer("forward"):
+            for indices, inputs in padded:
+                logits[indices] = self.backend.logits(dict(inputs))
+        return logits
+
+    def predict_probabilities(
+        self, processed_texts: List[str], max_batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Class probabilities for already-preprocessed texts (offline scoring).
+        """
+        if not processed_texts:
+            return np.zeros((0, self.config.num_labels), dtype=np.float32)
+        logits = self._predict_logits_batch(processed_texts, max_batch_size)
+        return torch.softmax(logits, dim=-1).numpy()
+
+    def _embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        if self.sentence_bert is None:
+            return [None] * len(texts)
+        with stage_timer("embedding"):
+            return self.sentence_bert.encode(texts)
+
+    def _build_response(self, preproc: Dict, metadata: Dict, probs) -> Dict:
+        label_idx = int(probs.argmax())
+        label = LABEL_MAP[label_idx]
+        confidence = float(probs[label_idx])
+
+        return {
+            "label": label,
+            "label_index": label_idx,
+            "confidence": confidence,
+            "probabilities": {LABEL_MAP[i]: float(p) for i, p in enumerate(probs)},
+            "preprocessing": preproc,
+            "metadata_features": metadata,
+        }
 
     def predict(self, text: str, include_embedding: bool = False) -> Dict:
         # Full pipeline
@@ -80,23 +159,50 @@ class HateSpeechModel:
         # Transformer prediction
         logits = self._predict_logits(processed_text)
         probs = torch.softmax(logits, dim=-1).cpu().numpy()
-        label_idx = int(probs.argmax())
-        label = LABEL_MAP[label_idx]
-        confidence = float(probs[label_idx])
-
-        response = {
-            "label": label,
-            "label_index": label_idx,
-            "confidence": confidence,
-            "probabilities": {LABEL_MAP[i]: float(p) for i, p in enumerate(probs)},
-            "preprocessing": preproc,
-            "metadata_features": metadata,
-        }
+        response = self._build_response(preproc, metadata, probs)
 
         if include_embedding:
             # Sentence-BERT embedding is expensive; compute only when explicitly requested.
-            response["sentence_bert_embedding"] = self.sentence_bert.encode(
-                [processed_text], normalize_embeddings=True
-            )[0].tolist()
+            response["sentence_bert_embedding"] = self._embed([processed_text])[0]
 
         return response
+
+    def close(self) -> None:
+        """
+        Drops the weights and the sentence encoder so their memory can be
+        reclaimed. The instance must not be used afterwards.
+        """
+        if self.sentence_bert is not None:
+            self.sentence_bert.close()
+        self.backend = None
+        self.model = None
+
+    def predict_batch(
+        self, texts: List[str], include_embedding: bool = False
+    ) -> List[Dict]:
+        """
+        Same pipeline as `predict`, but runs the transformer once over all texts.
+        """
+        if not texts:
+            return []
+
+        # Never fork spaCy workers on the request path.
+        preprocs = self.preprocessor.preprocess_batch(texts, n_process=1)
+        processed_texts = [p["lemmatized"] or p["normalized"] for p in preprocs]
+        metadata = self.feature_extractor.to_rows(
+            self.feature_extractor.extract_batch([p["normalized"] for p in preprocs])
+        )
+
+        logits = self._predict_logits_batch(processed_texts)
+        probs = torch.softmax(logits, dim=-1).cpu().numpy()
+        responses = [
+            self._build_response(preprocs[i], metadata[i], probs[i])
+            for i in range(len(texts))
+        ]
+
+        if include_embedding:
+            embeddings = self._embed(processed_texts)
+            for response, embedding in zip(responses, embeddings):
+                response["sentence_bert_embedding"] = embedding
+
+        return responses
@@ -0,0 +1,102 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+from tqdm import tqdm
+
+from .preprocessing import PreprocessingConfig, TextPreprocessor
+
+_worker_preprocessor: Optional[TextPreprocessor] = None
+
+
+def _init_worker(config: PreprocessingConfig) -> None:
+    # Each worker loads spaCy exactly once.
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(config)
+
+
+def _processed_texts(preprocessor: TextPreprocessor, texts: List[str]) -> List[str]:
+    return [
+        preproc["lemmatized"] or preproc["normalized"]
+        for preproc in preprocessor.preprocess_batch(texts, n_process=1)
+    ]
+
+
+def _preprocess_chunk(texts: List[str]) -> List[str]:
+    return _processed_texts(_worker_preprocessor, texts)
+
+
+class PreprocessPool:
+    """
+    Runs `TextPreprocessor` over texts in worker processes and returns the
+    model input text (lemmatized, falling back to normalized) in input order.
+    With num_workers <= 1 everything runs in the calling process.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 1,
+        config: Optional[PreprocessingConfig] = None,
+        chunk_size: int = 256,
+    ):
+        self.num_workers = num_workers
+        self.config = config or PreprocessingConfig()
+        self.chunk_size = max(1, chunk_size)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._local: Optional[TextPreprocessor] = None
+
+    def __enter__(self) -> "PreprocessPool":
+        if self.num_workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.config,),
+            )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _chunks(self, texts: List[str]) -> List[List[str]]:
+        return [
+            texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)
+        ]
+
+    def submit(self, texts: List[str]) -> Callable[[], List[str]]:
+        """
+        Starts preprocessing and returns a callable that blocks for the result,
+        so callers can overlap preprocessing with other work.
+        """
+        if self._pool is None:
+            if self._local is None:
+                self._local = TextPreprocessor(self.config)
+            result = _processed_texts(self._local, texts)
+            return lambda: result
+
+        futures: List[Future] = [
+            self._pool.submit(_preprocess_chunk, chunk) for chunk in self._chunks(texts)
+        ]
+        return lambda: [text for future in futures for text in future.result()]
+
+    def map(self, texts: List[str], progress: bool = False) -> List[str]:
+        """
+        Preprocesses `texts` and returns results in input order. Chunks are
+        collected in submission order, so the output is deterministic and
+        identical to the serial path regardless of worker scheduling.
+        """
+        if self._pool is None or not progress:
+            return self.submit(texts)()
+
+        futures: List[Future] = [
+            self._pool.submit(_preprocess_chunk, chunk) for chunk in self._chunks(texts)
+        ]
+        results: List[str] = []
+        with tqdm(total=len(texts), desc="Preprocessing", unit="text") as bar:
+            for future in futures:
+                chunk = future.result()
+                results.extend(chunk)
+                bar.update(len(chunk))
+        return results
@@ -1,12 +1,17 @@
+import hashlib
+import json
 import re
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
 
 import emoji
-import langdetect
 import spacy
 from nltk.corpus import stopwords
 
+from .config import settings
+from .language import LanguageIdentifier
+from .metrics import stage_timer
+
 # Run once in setup:
 # import nltk; nltk.download('stopwords')
 
@@ -34,6 +39,16 @@ class PreprocessingConfig:
     lemmatize: bool = True
     remove_stopwords: bool = False
     language: str = "en"
+    detect_language: bool = field(
+        default_factory=lambda: settings.LANGUAGE_DETECTION_ENABLED
+    )
+    language_min_chars: int = field(
+        default_factory=lambda: settings.LANGUAGE_DETECTION_MIN_CHARS
+    )
+
+    def fingerprint(self) -> str:
+        payload = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:12]
 
 
 class TextPreprocessor:
@@ -41,6 +56,13 @@ class TextPreprocessor:
         self.config = config
         self.nlp = spacy.load("en_core_web_sm", disable=["ner", "parser"])
         self.stopwords = set(stopwords.words("english"))
+        self.language_identifier = LanguageIdentifier(
+            enabled=config.detect_language,
+            min_chars=config.language_min_chars,
+            cache_size=settings.LANGUAGE_DETECTION_CACHE_SIZE,
+            seed=settings.LANGUAGE_DETECTION_SEED,
+            default_language=config.language,
+        )
 
         # Simple slang dictionary (extend this in a JSON or YAML file if needed)
         self.slang_map: Dict[str, str] = {
@@ -55,10 +77,7 @@ class TextPreprocessor:
         }
 
     def detect_language(self, text: str) -> str:
-        try:
-            return langdetect.detect(text)
-        except langdetect.lang_detect_exception.LangDetectException:
-            return "unknown"
+        return self.language_identifier.detect(text)
 
     def normalize_text(self, text: str) -> str:
         original_text = text
@@ -89,10 +108,7 @@ class TextPreprocessor:
 
         return text.strip()
 
-    def lemmatize_text(self, text: str) -> str:
-        if not self.config.lemmatize:
-            return text
-        doc = self.nlp(text)
+    def _doc_to_text(self, doc) -> str:
         tokens = []
         for token in doc:
             if self.config.remove_stopwords and token.text.lower() in self.stopwords:
@@ -102,13 +118,32 @@ class TextPreprocessor:
             tokens.append(token.lemma_)
         return " ".join(tokens)
 
+    def lemmatize_text(self, text: str) -> str:
+        if not self.config.lemmatize:
+            return text
+        return self._doc_to_text(self.nlp(text))
+
+    def lemmatize_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 256,
+        n_process: int = 1,
+    ) -> List[str]:
+        if not self.config.lemmatize:
+            return list(texts)
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        return [self._doc_to_text(doc) for doc in docs]
+
     def preprocess(self, text: str) -> Dict[str, str]:
         """
         Returns dict with original, normalized, lemmatized, and language.
         """
-        lang = self.detect_language(text)
-        normalized = self.normalize_text(text)
-        lemmatized = self.lemmatize_text(normalized)
+        with stage_timer("language_detection"):
+            lang = self.detect_language(text)
+        with stage_timer("normalization"):
+            normalized = self.normalize_text(text)
+        with stage_timer("lemmatization"):
+            lemmatized = self.lemmatize_text(normalized)
 
         return {
             "original": text,
@@ -116,3 +151,33 @@ class TextPreprocessor:
             "normalized": normalized,
             "lemmatized": lemmatized,
         }
+
+    def preprocess_batch(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Batch version of `preprocess`; lemmatizes all texts through `nlp.pipe`.
+        """
+        with stage_timer("language_detection"):
+            langs = self.language_identifier.detect_batch(texts)
+        with stage_timer("normalization"):
+            normalized = [self.normalize_text(t) for t in texts]
+        with stage_timer("lemmatization"):
+            lemmatized = self.lemmatize_batch(
+                normalized,
+                batch_size=batch_size or settings.SPACY_BATCH_SIZE,
+                n_process=n_process or settings.SPACY_N_PROCESS,
+            )
+
+        return [
+            {
+                "original": text,
+                "language": lang,
+                "normalized": norm,
+                "lemmatized": lemma,
+            }
+            for text, lang, norm, lemma in zip(texts, langs, normalized, lemmatized)
+        ]
@@ -0,0 +1,50 @@
+import ctypes
+import gc
+import os
+
+import torch
+
+from .config import settings
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def configure_torch_threads(num_workers: int = 1) -> int:
+    """
+    Splits the available cores between serving workers so that N workers
+    running forward passes at once do not oversubscribe the CPU.
+    """
+    threads = settings.TORCH_NUM_THREADS or max(1, available_cores() // max(1, num_workers))
+    torch.set_num_threads(threads)
+    return threads
+
+
+def freeze_for_fork() -> None:
+    """
+    Moves everything allocated so far into the GC's permanent generation.
+    Collections in forked workers then never write to those objects, so
+    their pages stay shared copy-on-write with the parent.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def release_memory() -> None:
+    """
+    Collects garbage and hands freed heap pages back to the OS, so memory
+    from a retired model is returned now rather than whenever the
+    allocator gets round to it.
+    """
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        # Not glibc; the freed memory is still reusable in-process.
+        pass
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .config import settings
+from .model import LABEL_MAP, HateSpeechModel
+from .parallel import PreprocessPool
+
+
+def progress_path(output: str) -> Path:
+    return Path(f"{output}.progress.json")
+
+
+def load_progress(output: str, input_path: str, chunk_size: int) -> Optional[Dict]:
+    """
+    Returns saved progress if it belongs to the same input and chunk size.
+    """
+    path = progress_path(output)
+    if not path.exists() or not Path(output).exists():
+        return None
+    progress = json.loads(path.read_text())
+    if progress.get("input") != str(Path(input_path).resolve()):
+        return None
+    if progress.get("chunk_size") != chunk_size:
+        return None
+    return progress
+
+
+def save_progress(output: str, progress: Dict) -> None:
+    path = progress_path(output)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(progress))
+    os.replace(tmp, path)
+
+
+def score_chunk(
+    model: HateSpeechModel,
+    df: pd.DataFrame,
+    processed_texts,
+    id_column: Optional[str],
+    batch_size: int,
+    with_probabilities: bool,
+) -> pd.DataFrame:
+    probs = model.predict_probabilities(processed_texts, max_batch_size=batch_size)
+    label_idx = probs.argmax(axis=-1)
+
+    out = pd.DataFrame({
+        "id": df[id_column].values if id_column else df.index.values,
+        "label": label_idx,
+    })
+    if with_probabilities:
+        out["label_name"] = [LABEL_MAP[int(i)] for i in label_idx]
+        out["confidence"] = probs.max(axis=-1)
+        for i, name in LABEL_MAP.items():
+            out[f"prob_{name}"] = probs[:, i]
+    return out
+
+
+def score_file(
+    input_path: str,
+    output: str,
+    model_dir: str = settings.MODEL_DIR,
+    text_column: str = "text",
+    id_column: Optional[str] = "id",
+    chunk_size: int = 10000,
+    workers: int = 1,
+    batch_size: int = settings.EVAL_BATCH_SIZE,
+    with_probabilities: bool = False,
+    resume: bool = True,
+) -> int:
+    """
+    Scores a CSV chunk by chunk and appends results to `output`.
+
+    Progress (completed chunks and output size) is checkpointed after every
+    chunk; a rerun truncates any partially written chunk and continues
+    from the last completed one.
+    """
+    progress = load_progress(output, input_path, chunk_size) if resume else None
+    if progress is None:
+        progress = {
+            "input": str(Path(input_path).resolve()),
+            "chunk_size": chunk_size,
+            "completed_chunks": 0,
+            "rows_written": 0,
+            "output_bytes": 0,
+        }
+        Path(output).unlink(missing_ok=True)
+    else:
+        with open(output, "r+b") as f:
+            f.truncate(progress["output_bytes"])
+        print(
+            f"Resuming after chunk {progress['completed_chunks']} "
+            f"({progress['rows_written']} rows already scored)"
+        )
+
+    model = HateSpeechModel(model_dir)
+    reader = pd.read_csv(input_path, chunksize=chunk_size)
+    started = time.perf_counter()
+    scored = 0
+
+    with PreprocessPool(num_workers=workers) as pool:
+        pending = None
+        for chunk_idx, df in enumerate(reader):
+            if chunk_idx < progress["completed_chunks"]:
+                continue
+            if id_column and id_column not in df.columns:
+                id_column = None
+
+            texts = df[text_column].fillna("").astype(str).tolist()
+            # Preprocess this chunk in the pool while the previous one runs through the model.
+            current = (df, pool.submit(texts))
+            if pending is not None:
+                scored += _write_chunk(model, pending, output, progress, id_column, batch_size, with_probabilities)
+            pending = current
+
+        if pending is not None:
+            scored += _write_chunk(model, pending, output, progress, id_column, batch_size, with_probabilities)
+
+    elapsed = time.perf_counter() - started
+    rate = scored / elapsed if elapsed > 0 else 0.0
+    print(f"Scored {scored} rows in {elapsed:.1f}s ({rate:.1f} samples/sec) -> {output}")
+    return scored
+
+
+def _write_chunk(model, pending, output, progress, id_column, batch_size, with_probabilities) -> int:
+    df, result = pending
+    out = score_chunk(model, df, result(), id_column, batch_size, with_probabilities)
+
+    write_header = progress["output_bytes"] == 0
+    out.to_csv(output, mode="a", header=write_header, index=False)
+
+    progress["completed_chunks"] += 1
+    progress["rows_written"] += len(out)
+    progress["output_bytes"] = os.path.getsize(output)
+    save_progress(output, progress)
+    print(f"Chunk {progress['completed_chunks']}: {progress['rows_written']} rows")
+    return len(out)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline batch scoring to a submission-style CSV")
+    parser.add_argument("--input", type=str, required=True)
+    parser.add_argument("--output", type=str, default="submission.csv")
+    parser.add_argument("--model-dir", type=str, default=settings.MODEL_DIR)
+    parser.add_argument("--text-column", type=str, default="text")
+    parser.add_argument("--id-column", type=str, default="id")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=settings.EVAL_BATCH_SIZE)
+    parser.add_argument("--with-probabilities", action="store_true")
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args()
+
+    score_file(
+        input_path=args.input,
+        output=args.output,
+        model_dir=args.model_dir,
+        text_column=args.text_column,
+        id_column=args.id_column,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        with_probabilities=args.with_probabilities,
+        resume=not args.no_resume,
+    )
@@ -11,13 +11,18 @@ from transformers import (
     AutoConfig,
     AutoModelForSequenceClassification,
     AutoTokenizer,
+    DataCollatorWithPadding,
     Trainer,
     TrainingArguments,
 )
 
 from .config import settings
+from .dataset_cache import cache_key, load_or_build
+from .backends import remove_artifacts
+from .export import export_all
 from .preprocessing import TextPreprocessor, PreprocessingConfig
 from .model import INV_LABEL_MAP
+from .parallel import PreprocessPool
 
 
 @dataclass
@@ -32,14 +37,26 @@ def load_split(path: str) -> pd.DataFrame:
     return pd.read_csv(path)
 
 
-def prepare_dataset(df: pd.DataFrame, preprocessor: TextPreprocessor) -> Dataset:
+def prepare_dataset(
+    df: pd.DataFrame,
+    preprocessor: TextPreprocessor,
+    num_workers: int = settings.PREPROCESS_NUM_WORKERS,
+) -> Dataset:
     texts = df["text"].tolist()
     labels = df["label"].apply(lambda x: INV_LABEL_MAP.get(x, int(x))).tolist()
 
-    processed_texts = []
-    for t in texts:
-        preproc = preprocessor.preprocess(t)
-        processed_texts.append(preproc["lemmatized"] or preproc["normalized"])
+    if num_workers > 1:
+        with PreprocessPool(
+            num_workers=num_workers,
+            config=preprocessor.config,
+            chunk_size=settings.PREPROCESS_CHUNK_SIZE,
+        ) as pool:
+            processed_texts = pool.map(texts, progress=True)
+    else:
+        processed_texts = [
+            preproc["lemmatized"] or preproc["normalized"]
+            for preproc in preprocessor.preprocess_batch(texts)
+        ]
 
     dataset = Dataset.from_dict({"text": processed_texts, "label": labels})
     return dataset
@@ -49,11 +66,38 @@ def tokenize_fn(examples, tokenizer, max_length: int):
     return tokenizer(
         examples["text"],
         truncation=True,
-        padding="max_length",
         max_length=max_length,
     )
 
 
+def build_tokenized_split(
+    path: str,
+    preprocessing_config: PreprocessingConfig,
+    tokenizer,
+    max_length: int,
+) -> Dataset:
+    """
+    Preprocessed + tokenized split, served from the on-disk cache when the
+    source file, preprocessing config, tokenizer and max length are unchanged.
+    """
+    def build() -> Dataset:
+        preprocessor = TextPreprocessor(preprocessing_config)
+        dataset = prepare_dataset(load_split(path), preprocessor)
+        dataset = dataset.map(
+            lambda batch: tokenize_fn(batch, tokenizer, max_length), batched=True
+        )
+        return dataset.map(
+            lambda batch: {"length": [len(ids) for ids in batch["input_ids"]]},
+            batched=True,
+        )
+
+    if not settings.DATASET_CACHE_ENABLED:
+        return build()
+
+    key = cache_key(path, preprocessing_config, tokenizer, max_length)
+    return load_or_build(settings.DATASET_CACHE_DIR, key, build)
+
+
 def compute_metrics(eval_pred):
     logits, labels = eval_pred
     preds = np.argmax(logits, axis=-1)
@@ -68,14 +112,8 @@ def compute_metrics(eval_pred):
 
 
 def train():
-    train_df = load_split(settings.TRAIN_FILE)
-    val_df = load_split(settings.VAL_FILE)
-
-    preprocessor = TextPreprocessor(PreprocessingConfig())
-    train_ds = prepare_dataset(train_df, preprocessor)
-    val_ds = prepare_dataset(val_df, preprocessor)
-
     cfg = TrainConfig()
+    preprocessing_config = PreprocessingConfig()
 
     tokenizer = AutoTokenizer.from_pretrained(cfg.model_name)
     model_config = AutoConfig.from_pretrained(
@@ -85,13 +123,16 @@ def train():
         cfg.model_name, config=model_config
     )
 
-    train_ds = train_ds.map(
-        lambda batch: tokenize_fn(batch, tokenizer, cfg.max_length), batched=True
+    train_ds = build_tokenized_split(
+        settings.TRAIN_FILE, preprocessing_config, tokenizer, cfg.max_length
     )
-    val_ds = val_ds.map(
-        lambda batch: tokenize_fn(batch, tokenizer, cfg.max_length), batched=True
+    val_ds = build_tokenized_split(
+        settings.VAL_FILE, preprocessing_config, tokenizer, cfg.max_length
     )
 
+    # Evaluation order does not affect metrics; sorting keeps eval batches length-homogeneous.
+    val_ds = val_ds.sort("length")
+
     train_ds.set_format(type="torch", columns=["input_ids", "attention_mask", "label"])
     val_ds.set_format(type="torch", columns=["input_ids", "attention_mask", "label"])
 
@@ -112,6 +153,7 @@ def train():
         metric_for_best_model="f1_macro",
         greater_is_better=True,
         seed=settings.SEED,
+        group_by_length=True,
     )
 
     trainer = Trainer(
@@ -120,6 +162,7 @@ def train():
         train_dataset=train_ds,
         eval_dataset=val_ds,
         tokenizer=tokenizer,
+        data_collator=DataCollatorWithPadding(tokenizer, padding="longest"),
         compute_metrics=compute_metrics,
     )
 
@@ -128,6 +171,12 @@ def train():
     tokenizer.save_pretrained(cfg.output_dir)
     print(f"Saved model to {cfg.output_dir}")
 
+    if settings.EXPORT_AFTER_TRAINING:
+        export_all(cfg.output_dir)
+    else:
+        # The weights were rewritten in place; older exports no longer match.
+        remove_artifacts(cfg.output_dir)
+
 
 if __name__ == "__main__":
     os.makedirs(settings.MODEL_DIR, exist_ok=True)
@@ -1,6 +1,7 @@
 from transformers import (
     DistilBertForSequenceClassification,
     DistilBertTokenizerFast,
+    DataCollatorWithPadding,
     TrainingArguments
 )
 from continual.replay_dataset import build_replay_dataset
@@ -13,6 +14,8 @@ import tempfile
 import random
 import numpy as np
 from hate_speech.config import settings
+from hate_speech.backends import remove_artifacts
+from hate_speech.export import export_all
 
 #MODEL_BASE = "models/transformer/v1"
 #NEW_MODEL = "models/transformer/v2"
@@ -38,7 +41,6 @@ def tokenize(batch, tokenizer):
     return tokenizer(
         batch["content"],
         truncation=True,
-        padding="max_length",
         max_length=128
     )
 def replace_latest_model(new_model_path: str, latest_path: str):
@@ -101,13 +103,15 @@ def retrain(output_version: str):
         logging_steps=50,
         save_strategy="no",
         report_to="none",
-        seed=42
+        seed=42,
+        group_by_length=True
     )
     trainer = FeedbackWeightedTrainer(
         model=model,
         args=args,
         train_dataset=dataset,
-        tokenizer=tokenizer
+        tokenizer=tokenizer,
+        data_collator=DataCollatorWithPadding(tokenizer, padding="longest")
     )
 
 
@@ -117,6 +121,12 @@ def retrain(output_version: str):
     model.save_pretrained(NEW_MODEL)
     tokenizer.save_pretrained(NEW_MODEL)
 
+    # Export CPU-optimized backends before the copy so latest gets them too
+    if settings.EXPORT_AFTER_TRAINING:
+        export_all(NEW_MODEL)
+    else:
+        remove_artifacts(NEW_MODEL)
+
     LATEST_MODEL = "models/transformer/latest"
     replace_latest_model(NEW_MODEL, LATEST_MODEL)
 